@@ -9,10 +9,11 @@ import sys
 import os
 
 # Make sure we can import from src
-sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
-
-# Run the application
-from src.main import main
+_ROOT_DIR = os.path.abspath(os.path.dirname(__file__))
+if _ROOT_DIR not in sys.path:
+    sys.path.insert(0, _ROOT_DIR)
 
 if __name__ == "__main__":
-    main()
+    # Import lazily so the UI module tree is only loaded when run as a script
+    from src.main import main
+    sys.exit(main())
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Application context for McpIDE.
+Gives components access to application-wide objects such as the main window.
+"""
+
+import weakref
+
+# Weak reference to the main window, set once it has been created
+_main_window_ref = None
+
+def set_main_window(window):
+    """Register the main window so other components can look it up"""
+    global _main_window_ref
+    _main_window_ref = weakref.ref(window) if window is not None else None
+
+def get_main_window():
+    """Get the main window, or None if it doesn't exist (anymore)"""
+    if _main_window_ref is None:
+        return None
+    return _main_window_ref()
@@ -4,9 +4,105 @@
 """
 Application settings management for McpIDE.
 Handles persistent settings storage and provides signals for settings changes.
+Settings are stored as a JSON file in the user's configuration directory.
 """
 
-from PySide6.QtCore import QSettings, QObject, Signal, Slot
+import os
+import json
+import logging
+from collections import defaultdict, deque
+from functools import partial
+from types import MappingProxyType
+
+from PySide6.QtCore import (
+    QCoreApplication, QSettings, QStandardPaths, QObject, QTimer, Signal, Slot
+)
+
+logger = logging.getLogger(__name__)
+
+# Name of the settings file inside the application config directory
+SETTINGS_FILE_NAME = "settings.json"
+
+# Delay before pending setting changes are written to disk (ms)
+SAVE_DELAY = 500
+
+# Allowed values for the theme and editor layout settings
+VALID_THEMES = frozenset({"dark", "light"})
+VALID_EDITOR_LAYOUTS = frozenset({"single", "split-horizontal", "split-vertical"})
+
+# Maximum number of entries kept in the recent workspaces list
+MAX_RECENT_WORKSPACES = 10
+
+# Default settings, shared read-only by all AppSettings instances
+DEFAULT_SETTINGS = MappingProxyType({
+    # Appearance
+    "theme": "dark",
+    "icon_theme": "default",
+
+    # Workspace
+    "recent_workspaces": (),  # Stored as a list, immutable default
+    "last_workspace": "",
+    "show_welcome_screen": True,
+    "welcome_tab_closed": False,
+
+    # Editor
+    "font_family": "Consolas",
+    "font_size": 12,
+    "tab_size": 4,
+    "use_spaces": True,
+    "show_line_numbers": True,
+    "word_wrap": False,
+    "auto_save": False,
+    "auto_save_interval": 30000,  # 30 seconds
+
+    # UI
+    "show_status_bar": True,
+    "show_menu_bar": True,
+    "show_activity_bar": True,
+    "editor_layout": "single",  # single, split-horizontal, split-vertical
+
+    # Terminal
+    "terminal_shell": "",  # Empty for system default
+    "terminal_font_family": "Consolas",
+    "terminal_font_size": 12,
+
+    # MCP
+    "mcp_enabled": True,
+    "mcp_server_port": 9000,
+    "mcp_expose_resources": True,
+    "mcp_tools_enabled": True
+})
+
+# Types of the non-string settings, values are coerced once when they are
+# loaded or set so getters never need to cast
+SETTING_TYPES = {
+    "recent_workspaces": list,
+    "show_welcome_screen": bool,
+    "welcome_tab_closed": bool,
+    "font_size": int,
+    "tab_size": int,
+    "use_spaces": bool,
+    "show_line_numbers": bool,
+    "word_wrap": bool,
+    "auto_save": bool,
+    "auto_save_interval": int,
+    "show_status_bar": bool,
+    "show_menu_bar": bool,
+    "show_activity_bar": bool,
+    "terminal_font_size": int,
+    "mcp_enabled": bool,
+    "mcp_server_port": int,
+    "mcp_expose_resources": bool,
+    "mcp_tools_enabled": bool
+}
+
+# MCP settings, reported through mcp_setting_changed when set
+MCP_SETTINGS = frozenset({
+    "mcp_enabled",
+    "mcp_server_port",
+    "mcp_expose_resources",
+    "mcp_tools_enabled"
+})
 
 class AppSettings(QObject):
     """
@@ -16,189 +112,300 @@ class AppSettings(QObject):
     theme_changed = Signal(str)
     recent_workspaces_changed = Signal(list)
     editor_font_changed = Signal(str, int)
+    mcp_setting_changed = Signal(str, object)
+    setting_changed = Signal(str, object)  # key, value; emitted for every write
     
     def __init__(self):
         super().__init__()
-        self.settings = QSettings()
+        self._path = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation),
+            SETTINGS_FILE_NAME
+        )
+        self._default_settings = DEFAULT_SETTINGS
         
-        # Default settings
-        self._default_settings = {
-            # Appearance
-            "theme": "dark",
-            "icon_theme": "default",
-            
-            # Workspace
-            "recent_workspaces": [],
-            "last_workspace": "",
-            "show_welcome_screen": True,
-            "welcome_tab_closed": False,
-            
-            # Editor
-            "font_family": "Consolas",
-            "font_size": 12,
-            "tab_size": 4,
-            "use_spaces": True,
-            "show_line_numbers": True,
-            "word_wrap": False,
-            "auto_save": False,
-            "auto_save_interval": 30000,  # 30 seconds
-            
-            # UI
-            "show_status_bar": True,
-            "show_menu_bar": True,
-            "show_activity_bar": True,
-            "editor_layout": "single",  # single, split-horizontal, split-vertical
-            
-            # Terminal
-            "terminal_shell": "",  # Empty for system default
-            "terminal_font_family": "Consolas",
-            "terminal_font_size": 12,
-            
-            # MCP
-            "mcp_enabled": True,
-            "mcp_server_port": 9000,
-            "mcp_expose_resources": True,
-            "mcp_tools_enabled": True
+        # Pending changes are written back in one go after a short delay
+        self._dirty = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY)
+        self._save_timer.timeout.connect(self.flush)
+        
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+        
+        # Setting values loaded once from the settings file, missing keys
+        # fall back to the defaults
+        self._cache = self._load()
+        
+        # Plain callbacks per key for in-process consumers, called directly
+        # without going through Qt signal dispatch
+        self._observers = defaultdict(list)
+        
+        # Signals emitted by set_setting for keys that have dedicated signals
+        self._setter_hooks = {
+            "theme": self.theme_changed.emit,
+            "recent_workspaces": self._on_recent_workspaces_set,
+            "font_family": self._emit_editor_font_changed,
+            "font_size": self._emit_editor_font_changed
         }
+        for key in MCP_SETTINGS:
+            self._setter_hooks[key] = partial(self.mcp_setting_changed.emit, key)
         
-        # Initialize settings with defaults if they don't exist
-        for key, value in self._default_settings.items():
-            if not self.settings.contains(key):
-                self.settings.setValue(key, value)
+        # Most recently used workspaces (newest first) with a set for membership checks
+        self._set_recent_workspaces(self._value("recent_workspaces"))
+    
+    def _load(self):
+        """Load the settings file, importing QSettings values on first run"""
+        values = self._read_file()
+        if values is None:
+            values = self._import_qsettings()
+            if values:
+                self._schedule_save()
+        return values
+    
+    def _read_file(self):
+        """Read the settings file, returning None if it is missing or invalid"""
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                values = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(values, dict):
+            return None
+        return {
+            key: self._coerce(key, value)
+            for key, value in values.items()
+            if key in self._default_settings
+        }
+    
+    def _import_qsettings(self):
+        """Import settings stored through QSettings by earlier versions"""
+        qsettings = QSettings()
+        values = {}
+        for key in self._default_settings:
+            if qsettings.contains(key):
+                values[key] = self._coerce(key, qsettings.value(key))
+        return values
+    
+    def _coerce(self, key, value):
+        """Convert a raw setting value to the type of that setting"""
+        value_type = SETTING_TYPES.get(key)
+        try:
+            if value_type is bool:
+                # QSettings INI files store booleans as strings
+                if isinstance(value, str):
+                    return value.lower() == "true"
+                return bool(value)
+            if value_type is int:
+                return int(value)
+            if value_type is list:
+                # QSettings returns a plain string for single-item lists
+                if isinstance(value, str):
+                    return [value]
+                return list(value or [])
+        except (TypeError, ValueError):
+            return self._default_settings[key]
+        return value
+    
+    def _schedule_save(self):
+        """Mark the settings as changed and restart the save timer"""
+        self._dirty = True
+        self._save_timer.start()
+    
+    @Slot()
+    def flush(self):
+        """Write pending setting changes to the settings file"""
+        self._save_timer.stop()
+        if not self._dirty:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            
+            # Write to a temporary file first so a crash can't corrupt the settings
+            tmp_path = self._path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, indent=2)
+            os.replace(tmp_path, self._path)
+            self._dirty = False
+        except OSError:
+            logger.warning("Could not save settings", exc_info=True)
+    
+    def _value(self, key):
+        """Read a setting from the in-memory values"""
+        if key in self._cache:
+            return self._cache[key]
+        return self._default_settings[key]
+    
+    def _set_value(self, key, value):
+        """Store a setting, schedule a save and notify observers"""
+        self._cache[key] = value
+        self._schedule_save()
+        self._notify(key, value)
+        self.setting_changed.emit(key, value)
+    
+    def _notify(self, key, value):
+        """Call the observers subscribed to a key"""
+        for callback in self._observers.get(key, ()):
+            callback(value)
+    
+    def subscribe(self, key, callback):
+        """Call callback(value) directly whenever the given key is written"""
+        self._observers[key].append(callback)
+    
+    def _set_recent_workspaces(self, workspaces):
+        """Rebuild the in-memory recent workspaces list"""
+        self._recent = deque(workspaces or [], maxlen=MAX_RECENT_WORKSPACES)
+        self._recent_set = set(self._recent)
     
     # Theme settings
     def get_theme(self):
         """Get the current theme (dark or light)"""
-        return self.settings.value("theme", "dark")
+        return self._value("theme")
     
     def set_theme(self, theme):
         """Set the theme and emit signal"""
-        if theme in ["dark", "light"]:
-            self.settings.setValue("theme", theme)
+        if theme in VALID_THEMES:
+            self._set_value("theme", theme)
             self.theme_changed.emit(theme)
     
     # Workspace settings
     def get_recent_workspaces(self):
         """Get list of recent workspaces"""
-        return self.settings.value("recent_workspaces", [])
+        return list(self._recent)
     
     def add_recent_workspace(self, workspace_path):
         """Add a workspace to recent workspaces and set as last workspace"""
-        workspaces = self.get_recent_workspaces()
-        
-        # Remove if already exists (to move to front)
-        if workspace_path in workspaces:
-            workspaces.remove(workspace_path)
-        
-        # Add to front of list
-        workspaces.insert(0, workspace_path)
+        if workspace_path in self._recent_set:
+            # Remove if already exists (to move to front)
+            self._recent.remove(workspace_path)
+        elif len(self._recent) == self._recent.maxlen:
+            # The oldest entry is about to fall off the end
+            self._recent_set.discard(self._recent[-1])
         
-        # Keep only the 10 most recent
-        workspaces = workspaces[:10]
+        # Add to front of list, the deque keeps only the most recent entries
+        self._recent.appendleft(workspace_path)
+        self._recent_set.add(workspace_path)
+        workspaces = list(self._recent)
         
-        # Save and emit signal
-        self.settings.setValue("recent_workspaces", workspaces)
-        self.settings.setValue("last_workspace", workspace_path)
-        self.settings.setValue("show_welcome_screen", False)
+        # Save all three keys in a single debounced write and emit signal
+        self._set_value("recent_workspaces", workspaces)
+        self._set_value("last_workspace", workspace_path)
+        self._set_value("show_welcome_screen", False)
         self.recent_workspaces_changed.emit(workspaces)
     
     def get_last_workspace(self):
         """Get the last opened workspace"""
-        return self.settings.value("last_workspace", "")
+        return self._value("last_workspace")
     
     def should_show_welcome_screen(self):
         """Check if welcome screen should be shown"""
-        return bool(self.settings.value("show_welcome_screen", True))
+        return self._value("show_welcome_screen")
     
     def set_show_welcome_screen(self, show):
         """Set whether to show welcome screen"""
-        self.settings.setValue("show_welcome_screen", bool(show))
+        self._set_value("show_welcome_screen", bool(show))
     
     def is_welcome_tab_closed(self):
         """Check if welcome tab was closed in previous session"""
-        return bool(self.settings.value("welcome_tab_closed", False))
+        return self._value("welcome_tab_closed")
     
     def set_welcome_tab_closed(self, closed):
         """Set whether welcome tab is closed"""
-        self.settings.setValue("welcome_tab_closed", bool(closed))
+        self._set_value("welcome_tab_closed", bool(closed))
     
     # Editor settings
     def get_font_family(self):
         """Get the editor font family"""
-        return self.settings.value("font_family", "Consolas")
+        return self._value("font_family")
     
     def get_font_size(self):
         """Get the editor font size"""
-        return int(self.settings.value("font_size", 12))
+        return self._value("font_size")
     
     def set_editor_font(self, family, size):
         """Set the editor font and emit signal"""
-        self.settings.setValue("font_family", family)
-        self.settings.setValue("font_size", size)
+        size = int(size)
+        self._set_value("font_family", family)
+        self._set_value("font_size", size)
         self.editor_font_changed.emit(family, size)
     
     def get_tab_size(self):
         """Get the editor tab size"""
-        return int(self.settings.value("tab_size", 4))
+        return self._value("tab_size")
     
     def get_use_spaces(self):
         """Get whether to use spaces instead of tabs"""
-        return bool(self.settings.value("use_spaces", True))
+        return self._value("use_spaces")
     
     def get_show_line_numbers(self):
         """Get whether to show line numbers"""
-        return bool(self.settings.value("show_line_numbers", True))
+        return self._value("show_line_numbers")
     
     def get_word_wrap(self):
         """Get whether to wrap words"""
-        return bool(self.settings.value("word_wrap", False))
+        return self._value("word_wrap")
     
     def get_auto_save(self):
         """Get whether auto-save is enabled"""
-        return bool(self.settings.value("auto_save", False))
+        return self._value("auto_save")
     
     def get_auto_save_interval(self):
         """Get auto-save interval in milliseconds"""
-        return int(self.settings.value("auto_save_interval", 30000))
+        return self._value("auto_save_interval")
     
     # UI settings
     def get_editor_layout(self):
         """Get the editor layout"""
-        return self.settings.value("editor_layout", "single")
+        return self._value("editor_layout")
     
     def set_editor_layout(self, layout):
         """Set the editor layout"""
-        if layout in ["single", "split-horizontal", "split-vertical"]:
-            self.settings.setValue("editor_layout", layout)
+        if layout in VALID_EDITOR_LAYOUTS:
+            self._set_value("editor_layout", layout)
     
     # MCP settings
     def is_mcp_enabled(self):
         """Check if MCP is enabled"""
-        return bool(self.settings.value("mcp_enabled", True))
+        return self._value("mcp_enabled")
     
     def get_mcp_server_port(self):
         """Get the MCP server port"""
-        return int(self.settings.value("mcp_server_port", 9000))
+        return self._value("mcp_server_port")
+    
+    def is_mcp_expose_resources(self):
+        """Check if the codebase is exposed as MCP resources"""
+        return self._value("mcp_expose_resources")
+    
+    def is_mcp_tools_enabled(self):
+        """Check if MCP tools are enabled"""
+        return self._value("mcp_tools_enabled")
     
     # Generic settings methods
     def set_setting(self, key, value):
         """Generic method to set a setting"""
         if key in self._default_settings:
-            self.settings.setValue(key, value)
+            value = self._coerce(key, value)
+            self._set_value(key, value)
             
             # Emit specific signals for certain settings
-            if key == "theme":
-                self.theme_changed.emit(value)
-            elif key == "recent_workspaces":
-                self.recent_workspaces_changed.emit(value)
-            elif key in ["font_family", "font_size"]:
-                self.editor_font_changed.emit(
-                    self.get_font_family(), 
-                    self.get_font_size()
-                )
+            hook = self._setter_hooks.get(key)
+            if hook is not None:
+                hook(value)
+    
+    def _on_recent_workspaces_set(self, workspaces):
+        """Sync the recent workspaces list after it was replaced"""
+        self._set_recent_workspaces(workspaces)
+        self.recent_workspaces_changed.emit(workspaces)
+    
+    def _emit_editor_font_changed(self, _value):
+        """Emit the editor font signal after the font family or size changed"""
+        self.editor_font_changed.emit(self.get_font_family(), self.get_font_size())
     
     def get_setting(self, key, default=None):
         """Generic method to get a setting"""
         if default is None and key in self._default_settings:
-            default = self._default_settings[key]
-        return self.settings.value(key, default)
+            return self._value(key)
+        return self._cache.get(key, default)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Application startup for McpIDE.
+Creates the QApplication, settings and main window and runs the event loop.
+"""
+
+import sys
+from PySide6.QtWidgets import QApplication, QSplashScreen
+from PySide6.QtCore import Qt, QCoreApplication
+from PySide6.QtGui import QGuiApplication, QPixmap, QColor
+
+def _create_splash_screen():
+    """Create a lightweight splash screen shown while the main window is built"""
+    pixmap = QPixmap(480, 240)
+    pixmap.fill(QColor(30, 30, 30))
+
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("Loading McpIDE...", Qt.AlignBottom | Qt.AlignHCenter, QColor(212, 212, 212))
+    return splash
+
+def main():
+    """Main application entry point"""
+    # These must be set before the application exists and avoid an extra
+    # re-layout when the first window is shown on fractional-scale screens
+    QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
+        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+    )
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+
+    # Create the application
+    app = QApplication(sys.argv)
+    app.setApplicationName("McpIDE")
+    app.setOrganizationName("McpIDE")
+    app.setOrganizationDomain("mcpide.org")
+
+    # Show the splash screen right away so the user sees something
+    # while the main window is being built
+    splash = _create_splash_screen()
+    splash.show()
+    app.processEvents()
+
+    # Import the settings and main window only after the splash screen has painted
+    from src.core.app_context import set_main_window
+    from src.core.app_settings import AppSettings
+    from src.ui.main_window import MainWindow
+
+    # Initialize settings
+    settings = AppSettings()
+
+    # Create and show the main window
+    window = MainWindow(settings)
+
+    # Register the main window so other components can access it
+    set_main_window(window)
+
+    window.show()
+    splash.finish(window)
+
+    # Start the event loop
+    return app.exec()
+
+if __name__ == "__main__":
+    sys.exit(main())
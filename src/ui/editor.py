@@ -8,11 +8,87 @@ Provides syntax highlighting, line numbers, and other editing features.
 
 import os
 import re
-from PySide6.QtWidgets import QPlainTextEdit, QWidget, QTextEdit
+from bisect import bisect_left
+from types import MappingProxyType
+from PySide6.QtWidgets import QPlainTextEdit, QWidget
 from PySide6.QtCore import Qt, Signal, Slot, QRect, QSize, QRegularExpression
-from PySide6.QtGui import QColor, QPainter, QFont, QTextCursor, QTextCharFormat, QTextDocument
+from PySide6.QtGui import (
+    QColor, QPainter, QFont, QTextCursor, QTextDocument,
+    QStaticText, QTransform, QPlainTextDocumentLayout, QTextOption
+)
+
+from src.core.app_context import get_main_window
+from src.utils.syntax_highlighter import PygmentsSyntaxHighlighter, BlockData
+
+# Maximum number of prepared line number texts kept per editor
+LINE_NUMBER_CACHE_SIZE = 4096
+
+# Maximum number of compiled search patterns kept per editor
+PATTERN_CACHE_SIZE = 32
+
+# Files with at least this many characters are highlighted in the background
+ASYNC_HIGHLIGHT_THRESHOLD = 100 * 1024
+
+# Find flags by (case_sensitive, whole_words, forward), built on first use
+_find_flags_cache = {}
+
+# Text inserted on Enter keyed by the indentation. The common indents are
+# never evicted, other indents are cached as they are used.
+_NEWLINE_INDENTS = MappingProxyType({indent: '\n' + indent for indent in ('', '\t', ' ' * 2, ' ' * 4, ' ' * 8)})
+_NEWLINE_INDENT_CACHE_SIZE = 64
+_newline_indents = {}
+
+def _cache_put(cache, key, value, max_size):
+    """Store a value in a dict cache, dropping the oldest entry when full"""
+    if len(cache) >= max_size:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+def _indent_and_opens_block(document, block):
+    """Get the leading indentation of a block and whether it ends with a colon"""
+    # Read characters straight from the document, walking forward over the
+    # indentation and backward over trailing whitespace, so the text of
+    # long lines is never copied
+    first = block.position()
+    end = first + block.length() - 1
+    indent = []
+    position = first
+    while position < end:
+        char = document.characterAt(position)
+        if char != ' ' and char != '\t':
+            break
+        indent.append(char)
+        position += 1
+
+    last = end - 1
+    while last >= position and document.characterAt(last) in ' \t':
+        last -= 1
+
+    return ''.join(indent), last >= position and document.characterAt(last) == ':'
+
+
+# Characters outside the BMP take two positions in a QTextDocument
+_NON_BMP_RE = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def _get_find_flags(case_sensitive, whole_words, forward):
+    """Get the QTextDocument find flags for a set of search options"""
+    key = (case_sensitive, whole_words, forward)
+    flags = _find_flags_cache.get(key)
+    if flags is None:
+        flags = QTextDocument.FindFlags()
+
+        if case_sensitive:
+            flags |= QTextDocument.FindCaseSensitively
+
+        if whole_words:
+            flags |= QTextDocument.FindWholeWords
+
+        if not forward:
+            flags |= QTextDocument.FindBackward
 
-from src.utils.syntax_highlighter import PygmentsSyntaxHighlighter, detect_language_from_filename
+        _find_flags_cache[key] = flags
+    return flags
 
 class LineNumberArea(QWidget):
     """Widget for displaying line numbers"""
@@ -34,6 +110,7 @@ class CodeEditor(QPlainTextEdit):
     cursor_position_changed = Signal(int, int)  # line, column
     file_dropped = Signal(str)  # Emitted when a file is dropped onto the editor
     search_finished = Signal(bool)  # Emitted when search is finished (found or not)
+    file_path_changed = Signal(str)  # Emitted when the editor's file path changes
 
     def __init__(self, settings, theme_manager):
         super().__init__()
@@ -42,6 +119,23 @@ class CodeEditor(QPlainTextEdit):
         self.file_path = None
         self._auto_indent = True
 
+        # Local mirrors of settings read on every paint and keystroke,
+        # kept up to date by the settings change slots
+        self._show_line_numbers = settings.get_show_line_numbers()
+        self._tab_size = settings.get_tab_size()
+        self._use_spaces = settings.get_use_spaces()
+
+        # Prepared line number texts keyed by (line number, bold)
+        self._line_number_cache = {}
+
+        # Block heights are cached in each block's BlockData, bumping the
+        # generation invalidates all of them
+        self._block_height_generation = 0
+
+        # Compiled search patterns, reused across find/replace calls
+        self._qregex_cache = {}
+        self._pattern_cache = {}
+
         self._setup_editor()
         self._setup_line_numbers()
         self._setup_context_menu()
@@ -60,9 +154,15 @@ class CodeEditor(QPlainTextEdit):
         font.setFixedPitch(True)
         self.setFont(font)
 
+        # Make sure the document keeps the plain text layout, which is much
+        # cheaper than the rich text QTextDocumentLayout
+        document = self.document()
+        if not isinstance(document.documentLayout(), QPlainTextDocumentLayout):
+            document.setDocumentLayout(QPlainTextDocumentLayout(document))
+
         # Set tab size
-        tab_size = self.settings.get_tab_size()
-        self.setTabStopDistance(tab_size * self.fontMetrics().horizontalAdvance(' '))
+        self.setTabStopDistance(self._tab_size * self.fontMetrics().horizontalAdvance(' '))
+        self._update_indent_unit()
 
         # Set word wrap
         try:
@@ -72,7 +172,6 @@ class CodeEditor(QPlainTextEdit):
                 self.setWordWrapMode(Qt.TextWrapMode.WidgetWidth)
         except AttributeError:
             # For older PySide6 versions
-            from PySide6.QtGui import QTextOption
             self.setWordWrapMode(QTextOption.NoWrap)
             if self.settings.get_word_wrap():
                 self.setWordWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
@@ -89,6 +188,8 @@ class CodeEditor(QPlainTextEdit):
     def _setup_line_numbers(self):
         """Set up line number area"""
         self.line_number_area = LineNumberArea(self)
+        self._update_line_number_fonts()
+        self._update_line_number_colors(self.settings.get_theme())
 
         self.blockCountChanged.connect(self.update_line_number_area_width)
         self.updateRequest.connect(self.update_line_number_area)
@@ -104,27 +205,45 @@ class CodeEditor(QPlainTextEdit):
         # Connect settings changes
         self.settings.theme_changed.connect(self._on_theme_changed)
         self.settings.editor_font_changed.connect(self._on_font_changed)
+        self.settings.setting_changed.connect(self._on_setting_changed)
 
         # Connect cursor position change
         self.cursorPositionChanged.connect(self._on_cursor_position_changed)
 
     def line_number_area_width(self):
         """Calculate width of line number area"""
-        if not self.settings.get_show_line_numbers():
+        if not self._show_line_numbers:
             return 0
 
-        digits = 1
-        max_num = max(1, self.blockCount())
-        while max_num >= 10:
-            max_num //= 10
-            digits += 1
-
-        space = 3 + self.fontMetrics().horizontalAdvance('9') * digits
-        return space
+        # The width only changes when the number of digits or the font changes
+        digits = len(str(max(1, self.blockCount())))
+        if digits != self._ln_digits:
+            self._ln_digits = digits
+            self._ln_width = 3 + self.fontMetrics().horizontalAdvance('9') * digits
+        return self._ln_width
+
+    def _update_line_number_fonts(self):
+        """Build the regular and bold line number fonts from the editor font"""
+        self._ln_font_regular = QFont(self.font())
+        self._ln_font_regular.setBold(False)
+        self._ln_font_bold = QFont(self.font())
+        self._ln_font_bold.setBold(True)
+        self._line_number_cache.clear()
+
+        # Force the line number area width to be recomputed
+        self._ln_digits = -1
+
+    def _update_line_number_colors(self, theme):
+        """Look up the line number colors for a theme"""
+        self._ln_bg = self.theme_manager.get_color("sidebar", theme)
+        self._ln_fg = self.theme_manager.get_color("line_number", theme)
+        self._ln_current_fg = QColor("#ffffff" if theme == "dark" else "#000000")
 
     def update_line_number_area_width(self, _):
         """Update line number area width"""
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        width = self.line_number_area_width()
+        if width != self.viewportMargins().left():
+            self.setViewportMargins(width, 0, 0, 0)
 
     def update_line_number_area(self, rect, dy):
         """Update line number area on scroll"""
@@ -145,95 +264,115 @@ class CodeEditor(QPlainTextEdit):
 
     def line_number_area_paint_event(self, event):
         """Paint line numbers"""
-        if not self.settings.get_show_line_numbers():
+        if not self._show_line_numbers:
             return
 
-        painter = QPainter(self.line_number_area)
-
-        # Set background color based on theme
-        theme = self.settings.get_theme()
-        bg_color = self.theme_manager.get_color("sidebar", theme)
-        text_color = self.theme_manager.get_color("line_number", theme)
+        event_rect = event.rect()
+        event_top = event_rect.top()
+        event_bottom = event_rect.bottom()
 
-        painter.fillRect(event.rect(), bg_color)
+        painter = QPainter(self.line_number_area)
+        painter.fillRect(event_rect, self._ln_bg)
 
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
         top = round(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
-        bottom = top + round(self.blockBoundingRect(block).height())
 
-        # Set text color
-        painter.setPen(text_color)
-
-        font = painter.font()
-        font.setBold(False)
-        painter.setFont(font)
+        # Everything below is constant for the whole paint
+        font_regular = self._ln_font_regular
+        font_bold = self._ln_font_bold
+        text_color = self._ln_fg
+        current_color = self._ln_current_fg
+        right = self.line_number_area.width() - 2
 
         # Highlight current line number
-        cursor = self.textCursor()
-        current_line = cursor.blockNumber()
-
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
-
-                # Use bold for current line number
-                if block_number == current_line:
-                    font = painter.font()
-                    font.setBold(True)
-                    painter.setFont(font)
-
-                    # Use different color for current line
-                    if theme == "dark":
-                        painter.setPen(QColor("#ffffff"))
-                    else:
-                        painter.setPen(QColor("#000000"))
-                else:
-                    font = painter.font()
-                    font.setBold(False)
+        current_line = self.textCursor().blockNumber()
+
+        # Only switch the painter's font and pen when the bold state flips
+        last_bold = None
+
+        # Without wrapping a block's height only depends on the font and the
+        # block's text, e.g. line separators or glyphs from taller fonts
+        use_height_cache = self.wordWrapMode() == QTextOption.NoWrap
+        height_generation = self._block_height_generation
+
+        while block.isValid():
+            # Stop as soon as we are past the area to repaint so blocks
+            # below the viewport are never laid out
+            if top > event_bottom:
+                break
+
+            if use_height_cache:
+                data = block.userData()
+                if data is None:
+                    data = BlockData()
+                    block.setUserData(data)
+                revision = block.revision()
+                if data.height_generation != height_generation or data.height_revision != revision:
+                    data.height = round(self.blockBoundingRect(block).height())
+                    data.height_generation = height_generation
+                    data.height_revision = revision
+                bottom = top + data.height
+            else:
+                bottom = top + round(self.blockBoundingRect(block).height())
+            if block.isVisible() and bottom >= event_top:
+                # Use bold and a different color for the current line number
+                is_current = block_number == current_line
+                font = font_bold if is_current else font_regular
+                if is_current != last_bold:
                     painter.setFont(font)
-                    painter.setPen(text_color)
+                    painter.setPen(current_color if is_current else text_color)
+                    last_bold = is_current
 
-                painter.drawText(0, top, self.line_number_area.width() - 2, self.fontMetrics().height(),
-                                Qt.AlignRight, number)
+                static_text = self._get_line_number_text(block_number + 1, is_current, font)
+                painter.drawStaticText(round(right - static_text.size().width()), top, static_text)
 
             block = block.next()
             top = bottom
-            bottom = top + round(self.blockBoundingRect(block).height())
             block_number += 1
 
+    def _get_line_number_text(self, number, bold, font):
+        """Get a prepared QStaticText for a line number, laid out only once"""
+        key = (number, bold)
+        static_text = self._line_number_cache.get(key)
+        if static_text is None:
+            static_text = QStaticText(str(number))
+            static_text.prepare(QTransform(), font)
+            _cache_put(self._line_number_cache, key, static_text, LINE_NUMBER_CACHE_SIZE)
+        return static_text
+
     def keyPressEvent(self, event):
         """Handle key press events for auto-indentation and other features"""
         # Auto-indentation for Enter key
         if self._auto_indent and event.key() == Qt.Key_Return:
             cursor = self.textCursor()
-            block = cursor.block()
-            text = block.text()
-            indent = ''
-
             # Get the indentation of the current line
-            for char in text:
-                if char == ' ' or char == '\t':
-                    indent += char
-                else:
-                    break
+            indent, opens_block = _indent_and_opens_block(self.document(), cursor.block())
 
             # Add extra indentation if line ends with a colon
-            if text.rstrip().endswith(':'):
-                if self.settings.get_use_spaces():
-                    indent += ' ' * self.settings.get_tab_size()
-                else:
-                    indent += '\t'
-
-            # Insert new line with indentation
-            super().keyPressEvent(event)
-            self.insertPlainText(indent)
+            if opens_block:
+                indent += self._indent_unit
+
+            text = _NEWLINE_INDENTS.get(indent)
+            if text is None:
+                text = _newline_indents.get(indent)
+                if text is None:
+                    text = '\n' + indent
+                    _cache_put(_newline_indents, indent, text, _NEWLINE_INDENT_CACHE_SIZE)
+
+            # Insert new line with indentation as a single edit, so it is
+            # one undo step and the block is highlighted once
+            cursor.beginEditBlock()
+            cursor.insertText(text)
+            cursor.endEditBlock()
+            self.setTextCursor(cursor)
+            self.ensureCursorVisible()
             return
 
         # Handle tab key for spaces
-        if event.key() == Qt.Key_Tab and self.settings.get_use_spaces():
-            spaces = ' ' * self.settings.get_tab_size()
-            self.insertPlainText(spaces)
+        if event.key() == Qt.Key_Tab and self._use_spaces:
+            self.textCursor().insertText(self._indent_unit)
+            self.ensureCursorVisible()
             return
 
         super().keyPressEvent(event)
@@ -245,32 +384,62 @@ class CodeEditor(QPlainTextEdit):
 
     def set_file_path(self, file_path):
         """Set the file path"""
+        changed = file_path != self.file_path
         self.file_path = file_path
 
         # Set syntax highlighter based on file extension
         if file_path:
             self.highlighter.set_lexer_from_filename(file_path)
 
+        if changed:
+            self.file_path_changed.emit(file_path or "")
+
     @Slot(str)
     def _on_theme_changed(self, theme_name):
         """Handle theme change"""
-        # Update line numbers
-        self.update()
+        # Update line numbers. The viewport repaints itself on the palette
+        # change, only the line number area needs an explicit update.
+        self._update_line_number_colors(theme_name)
         self.line_number_area.update()
 
         # Update syntax highlighter theme
         self.highlighter.set_theme(theme_name)
 
+    def _update_indent_unit(self):
+        """Cache the text inserted for one level of indentation"""
+        if self._use_spaces:
+            self._indent_unit = ' ' * self._tab_size
+        else:
+            self._indent_unit = '\t'
+
+    @Slot(str, object)
+    def _on_setting_changed(self, key, value):
+        """Handle changes to settings without a dedicated signal"""
+        if key == "show_line_numbers":
+            self._show_line_numbers = value
+            self.update_line_number_area_width(0)
+            cr = self.contentsRect()
+            self.line_number_area.setGeometry(QRect(cr.left(), cr.top(), self.line_number_area_width(), cr.height()))
+        elif key == "tab_size":
+            self._tab_size = value
+            self.setTabStopDistance(value * self.fontMetrics().horizontalAdvance(' '))
+            self._update_indent_unit()
+        elif key == "use_spaces":
+            self._use_spaces = value
+            self._update_indent_unit()
+
     @Slot(str, int)
     def _on_font_changed(self, family, size):
         """Handle font change"""
         font = QFont(family, size)
         font.setFixedPitch(True)
         self.setFont(font)
+        self._update_line_number_fonts()
+        self._block_height_generation += 1
 
         # Update tab size
-        tab_size = self.settings.get_tab_size()
-        self.setTabStopDistance(tab_size * self.fontMetrics().horizontalAdvance(' '))
+        self.setTabStopDistance(self._tab_size * self.fontMetrics().horizontalAdvance(' '))
+        self._update_indent_unit()
 
         # Update line numbers
         self.update_line_number_area_width(0)
@@ -288,11 +457,6 @@ class CodeEditor(QPlainTextEdit):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-
-            self.setPlainText(content)
-            self.set_file_path(file_path)
-            self.document().setModified(False)
-            return True
         except UnicodeDecodeError:
             # Handle binary files
             return False
@@ -300,24 +464,36 @@ class CodeEditor(QPlainTextEdit):
             # Handle other errors
             return False
 
-    def save_file(self, file_path=None):
-        """Save the editor content to a file"""
-        if file_path is None:
-            file_path = self.file_path
-
-        if not file_path:
-            return False
+        self.set_file_content(file_path, content)
+        return True
 
+    def set_file_content(self, file_path, content):
+        """Show the already read content of a file in the editor"""
+        # Detach the highlighter while the text is inserted so the
+        # document is highlighted once with the right lexer afterwards,
+        # and don't record the initial text on the undo stack
+        document = self.document()
+        self.highlighter.setDocument(None)
+        document.setUndoRedoEnabled(False)
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(self.toPlainText())
-
+            self.setPlainText(content)
             self.set_file_path(file_path)
-            self.document().setModified(False)
-            return True
-        except Exception:
-            # Handle errors
-            return False
+        finally:
+            document.setUndoRedoEnabled(True)
+            self.highlighter.setDocument(document)
+
+        # Tokenize large files on a worker thread so the editor stays responsive
+        if len(content) >= ASYNC_HIGHLIGHT_THRESHOLD:
+            self.highlighter.rehighlight_async()
+
+        document.setModified(False)
+
+    def text_for_save(self):
+        """Get the document text to write to a file"""
+        # One copy of the raw text with the block separators turned into
+        # newlines. Unlike toPlainText() this keeps non-breaking spaces and
+        # line separators as they are.
+        return self.document().toRawText().replace('\u2029', '\n')
 
     def dragEnterEvent(self, event):
         """Handle drag enter event"""
@@ -342,13 +518,10 @@ class CodeEditor(QPlainTextEdit):
                 # If we have a parent tab widget, use it as the target
                 if hasattr(self, '_parent_tab_widget') and self._parent_tab_widget:
                     # This will ensure the file opens in the same split view
-                    from PySide6.QtCore import QCoreApplication
-                    app = QCoreApplication.instance()
-                    if hasattr(app, 'main_window'):
-                        # Get the main window and set the target tab widget
-                        main_window = app.main_window
-                        if hasattr(main_window, 'split_view_container'):
-                            main_window.split_view_container._last_drop_target = self._parent_tab_widget
+                    main_window = get_main_window()
+                    if main_window is not None and hasattr(main_window, 'split_view_container'):
+                        # Set the target tab widget on the main window
+                        main_window.split_view_container._last_drop_target = self._parent_tab_widget
 
                 # Emit signal with the file path
                 self.file_dropped.emit(file_path)
@@ -362,32 +535,20 @@ class CodeEditor(QPlainTextEdit):
 
     def find_text(self, text, case_sensitive=False, whole_words=False, regex=False, forward=True):
         """Find text in the document"""
-        # Create find flags
-        flags = QTextDocument.FindFlags()
-
-        if case_sensitive:
-            flags |= QTextDocument.FindCaseSensitively
-
-        if whole_words:
-            flags |= QTextDocument.FindWholeWords
-
-        if not forward:
-            flags |= QTextDocument.FindBackward
+        flags = _get_find_flags(case_sensitive, whole_words, forward)
 
-        # Use regex if specified
+        # Resolve what to search for once, both passes use the same object
         if regex:
-            try:
-                pattern = QRegularExpression(text)
-                if not case_sensitive:
-                    pattern.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
-                found = self.document().find(pattern, self.textCursor(), flags)
-            except Exception:
+            needle = self._get_search_regex(text, case_sensitive)
+            if not needle.isValid():
                 # Invalid regex
                 self.search_finished.emit(False)
                 return False
         else:
             # Use plain text search
-            found = self.document().find(text, self.textCursor(), flags)
+            needle = text
+
+        found = self.document().find(needle, self.textCursor(), flags)
 
         # If not found, try wrapping around
         if found.isNull():
@@ -401,13 +562,7 @@ class CodeEditor(QPlainTextEdit):
             self.setTextCursor(cursor)
 
             # Try search again
-            if regex:
-                pattern = QRegularExpression(text)
-                if not case_sensitive:
-                    pattern.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
-                found = self.document().find(pattern, self.textCursor(), flags)
-            else:
-                found = self.document().find(text, self.textCursor(), flags)
+            found = self.document().find(needle, self.textCursor(), flags)
 
         # If found, select the text
         if not found.isNull():
@@ -439,7 +594,7 @@ class CodeEditor(QPlainTextEdit):
         matches = False
         if regex:
             try:
-                pattern = re.compile(find_text, re.IGNORECASE if not case_sensitive else 0)
+                pattern = self._build_pattern(find_text, case_sensitive, regex=True)
                 matches = bool(pattern.fullmatch(selected_text))
             except Exception:
                 # Invalid regex
@@ -464,32 +619,86 @@ class CodeEditor(QPlainTextEdit):
         cursor.insertText(replace_text)
         return True
 
+    def _get_search_regex(self, text, case_sensitive):
+        """Get a cached QRegularExpression for a search"""
+        key = (text, case_sensitive)
+        pattern = self._qregex_cache.get(key)
+        if pattern is None:
+            pattern = QRegularExpression(text)
+            if not case_sensitive:
+                pattern.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
+            # Compile (and JIT) the pattern now rather than on the first match
+            pattern.optimize()
+            _cache_put(self._qregex_cache, key, pattern, PATTERN_CACHE_SIZE)
+        return pattern
+
+    def _build_pattern(self, find_text, case_sensitive=False, whole_words=False, regex=False):
+        """Get a cached Python regular expression matching the find text"""
+        key = (find_text, case_sensitive, whole_words, regex)
+        compiled = self._pattern_cache.get(key)
+        if compiled is None:
+            pattern = find_text if regex else re.escape(find_text)
+            if whole_words:
+                pattern = r'\b(?:' + pattern + r')\b'
+            flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+            compiled = re.compile(pattern, flags)
+            _cache_put(self._pattern_cache, key, compiled, PATTERN_CACHE_SIZE)
+        return compiled
+
     def replace_all(self, find_text, replace_text, case_sensitive=False, whole_words=False, regex=False):
         """Replace all occurrences of the find text"""
-        # Save the current cursor position
-        original_cursor = self.textCursor()
+        # Same text as saved, non-breaking spaces and line separators stay
+        # as they are so positions match the document
+        content = self.text_for_save()
+
+        # Collect all matches. Find matches within one line at a time, so
+        # patterns are run line by line and can't match across lines.
+        if not regex and not whole_words and case_sensitive:
+            if not find_text:
+                return 0
+            spans = []
+            start = content.find(find_text)
+            while start != -1:
+                end = start + len(find_text)
+                spans.append((start, end))
+                start = content.find(find_text, end)
+        else:
+            try:
+                pattern = self._build_pattern(find_text, case_sensitive, whole_words, regex)
+            except re.error:
+                # Invalid regex
+                return 0
+            spans = []
+            line_start = 0
+            for line in content.split('\n'):
+                for match in pattern.finditer(line):
+                    spans.append((line_start + match.start(), line_start + match.end()))
+                line_start += len(line) + 1
+
+        if not spans:
+            return 0
 
-        # Move to the start of the document
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-        self.setTextCursor(cursor)
+        scroll_value = self.verticalScrollBar().value()
 
-        # Count replacements
-        count = 0
+        # Qt positions count UTF-16 code units, so each character outside
+        # the BMP before a position adds one
+        astral = [match.start() for match in _NON_BMP_RE.finditer(content)]
+        if astral:
+            spans = [
+                (start + bisect_left(astral, start), end + bisect_left(astral, end))
+                for start, end in spans
+            ]
 
-        # Start a single undo operation for all replacements
+        # Replace from the end so earlier positions stay valid, in a
+        # single undo operation. Untouched blocks keep their highlighting.
+        cursor = QTextCursor(self.document())
         cursor.beginEditBlock()
-
-        # Replace all occurrences
-        while self.find_text(find_text, case_sensitive, whole_words, regex):
-            cursor = self.textCursor()
+        for start, end in reversed(spans):
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
             cursor.insertText(replace_text)
-            count += 1
-
-        # End the edit block
         cursor.endEditBlock()
 
-        # Restore the original cursor position
-        self.setTextCursor(original_cursor)
+        self.verticalScrollBar().setValue(scroll_value)
 
-        return count
+        return len(spans)
@@ -7,20 +7,101 @@ Provides a tree view of files and directories with context menu actions.
 """
 
 import os
+import shutil
 from PySide6.QtWidgets import (
     QTreeView, QFileSystemModel, QVBoxLayout, QWidget,
     QLineEdit, QMenu, QMessageBox, QInputDialog, QFileDialog,
     QAbstractItemView
 )
-from PySide6.QtCore import Qt, QDir, Signal, Slot, QModelIndex, QSize
+from PySide6.QtCore import (
+    Qt, QDir, QFileInfo, Signal, Slot, QModelIndex, QSize, QTimer, QObject, QRunnable, QThreadPool,
+    QSortFilterProxyModel, QRegularExpression
+)
 from PySide6.QtGui import QAction, QKeySequence
 
+# Delay before applying the search filter, in milliseconds
+FILTER_DELAY = 200
+
+# Shorter search texts match nearly everything and are not applied
+MIN_FILTER_LENGTH = 2
+
+# Depth and entries per directory scanned ahead when the root changes
+WARM_CACHE_DEPTH = 2
+WARM_CACHE_ENTRIES = 200
+
+
+class _DeleteTaskSignals(QObject):
+    """Signals for the background delete task"""
+    finished = Signal(str, str)  # path, error message (empty on success)
+
+
+class _DeleteTreeTask(QRunnable):
+    """Deletes a directory tree on a thread pool thread"""
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.signals = _DeleteTaskSignals()
+
+    def run(self):
+        try:
+            shutil.rmtree(self.path)
+            error = ""
+        except Exception as e:
+            error = str(e)
+        self.signals.finished.emit(self.path, error)
+
+
+class _WarmDirectoryTask(QRunnable):
+    """
+    Scans the first levels of a directory tree on a thread pool thread, so
+    the OS caches are hot when the user expands folders. Touches no Qt objects.
+    """
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def run(self):
+        directories = [self.path]
+        for _ in range(WARM_CACHE_DEPTH):
+            subdirectories = []
+            for directory in directories:
+                try:
+                    with os.scandir(directory) as entries:
+                        for count, entry in enumerate(entries):
+                            if count >= WARM_CACHE_ENTRIES:
+                                break
+                            # Uses the type from readdir where available
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirectories.append(entry.path)
+                except OSError:
+                    continue
+            directories = subdirectories
+
+
+class _FileFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filters file names with a compiled regular expression. Directories are
+    always kept so they can still be expanded, as with the model's name filters.
+    """
+    def filterAcceptsRow(self, source_row, source_parent):
+        regex = self.filterRegularExpression()
+        if not regex.pattern():
+            return True
+
+        model = self.sourceModel()
+        index = model.index(source_row, 0, source_parent)
+        if model.isDir(index):
+            return True
+        return regex.match(model.fileName(index)).hasMatch()
+
+
 class FileExplorer(QWidget):
     """
     File explorer widget for browsing and managing files
     """
     file_activated = Signal(str)  # Emitted when a file is activated (double-clicked)
     compare_files_requested = Signal(str, str)  # Emitted when file comparison is requested (file1, file2)
+    _file_double_clicked = Signal(str)  # Path of a double-clicked file, handled queued
 
     def __init__(self, settings, theme_manager):
         super().__init__()
@@ -28,6 +109,14 @@ class FileExplorer(QWidget):
         self.theme_manager = theme_manager
         self.current_path = None
 
+        # Search filter applied after typing pauses
+        self._pending_filter = ""
+        self._last_filter = ""
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY)
+        self._filter_timer.timeout.connect(self._apply_filter)
+
         self._setup_ui()
         self._connect_signals()
 
@@ -46,10 +135,18 @@ class FileExplorer(QWidget):
         # File system model
         self.model = QFileSystemModel()
         self.model.setReadOnly(False)
+        # Skip the per-folder custom icon lookup (desktop.ini on Windows)
+        # when directories are listed
+        self.model.setOption(QFileSystemModel.DontUseCustomDirectoryIcons, True)
+
+        # Search filtering happens in a proxy with a compiled regex, so the
+        # file system model never has to re-run its glob matching
+        self.proxy_model = _FileFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
 
         # Tree view
         self.tree_view = QTreeView()
-        self.tree_view.setModel(self.model)
+        self.tree_view.setModel(self.proxy_model)
         self.tree_view.setDragEnabled(True)
         self.tree_view.setAcceptDrops(True)
         self.tree_view.setDropIndicatorShown(True)
@@ -58,16 +155,40 @@ class FileExplorer(QWidget):
         # Enable drag and drop
         self.tree_view.setDragDropMode(QAbstractItemView.DragOnly)
 
+        # All rows have the same height, so the view can skip per-row size
+        # hints and only lay out visible rows
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setAnimated(False)
+        self.tree_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.tree_view.setTextElideMode(Qt.ElideRight)
+
         # Hide unnecessary columns
         self.tree_view.setHeaderHidden(True)
-        for i in range(1, self.model.columnCount()):
-            self.tree_view.hideColumn(i)
+        header = self.tree_view.header()
+        self.tree_view.setUpdatesEnabled(False)
+        for i in range(1, header.count()):
+            header.setSectionHidden(i, True)
+        self.tree_view.setUpdatesEnabled(True)
 
         self.layout.addWidget(self.tree_view)
 
+        # Context menu, built once and adjusted for each item
+        self._menu = QMenu(self)
+        self._new_file_action = self._menu.addAction("New File")
+        self._new_folder_action = self._menu.addAction("New Folder")
+        self._menu_separator = self._menu.addSeparator()
+        self._open_action = self._menu.addAction("Open")
+        self._compare_action = self._menu.addAction("Compare With...")
+        self._rename_action = self._menu.addAction("Rename")
+        self._delete_action = self._menu.addAction("Delete")
+
     def _connect_signals(self):
         """Connect signals to slots"""
+        # The index is resolved to a path right away, since a filter change
+        # can invalidate it. The rest is queued so the view finishes
+        # handling the click first.
         self.tree_view.doubleClicked.connect(self._on_item_double_clicked)
+        self._file_double_clicked.connect(self._open_double_clicked_file, Qt.QueuedConnection)
         self.tree_view.customContextMenuRequested.connect(self._show_context_menu)
         self.search_box.textChanged.connect(self._filter_files)
 
@@ -76,32 +197,61 @@ class FileExplorer(QWidget):
 
     def set_root_path(self, path):
         """Set the root path for the file explorer"""
-        if os.path.exists(path):
+        # A single stat answers both exists and is-directory
+        info = QFileInfo(path)
+        if info.exists() and info.isDir():
             self.current_path = path
             index = self.model.setRootPath(path)
-            self.tree_view.setRootIndex(index)
+            self.tree_view.setRootIndex(self.proxy_model.mapFromSource(index))
+
+            # Warm the OS caches for the first levels in the background
+            QThreadPool.globalInstance().start(_WarmDirectoryTask(path))
 
     @Slot(QModelIndex)
     def _on_item_double_clicked(self, index):
         """Handle double-click on an item"""
-        path = self.model.filePath(index)
-        if os.path.isfile(path):
-            try:
-                # Make sure the file exists and is readable
-                with open(path, 'r', encoding='utf-8') as _:
-                    pass
-                self.file_activated.emit(path)
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not open file: {str(e)}")
+        index = self.proxy_model.mapToSource(index)
+        # The model's cached row type avoids another stat of the file
+        if not self.model.isDir(index):
+            self._file_double_clicked.emit(self.model.filePath(index))
 
     @Slot(str)
-    def _filter_files(self, text):
-        """Filter files based on search text"""
-        if not text:
-            self.model.setNameFilters([])
+    def _open_double_clicked_file(self, path):
+        """Open a double-clicked file if it is readable"""
+        # Make sure the file is readable without reading it, the editor
+        # decodes the contents when it loads the file
+        if os.access(path, os.R_OK):
+            self.file_activated.emit(path)
         else:
-            self.model.setNameFilters([f"*{text}*"])
-        self.model.setNameFilterDisables(False)
+            QMessageBox.critical(self, "Error", f"Could not open file: permission denied: '{path}'")
+
+    @Slot(str)
+    def _filter_files(self, text):
+        """Filter files based on search text once typing pauses"""
+        if len(text) < MIN_FILTER_LENGTH:
+            text = ""
+        self._pending_filter = text
+        if text == self._last_filter:
+            # Nothing to refilter, e.g. the text was typed and erased again
+            self._filter_timer.stop()
+            return
+        self._filter_timer.start()
+
+    @Slot()
+    def _apply_filter(self):
+        """Apply the pending search text to the model"""
+        text = self._pending_filter
+        if text == self._last_filter:
+            return
+        self._last_filter = text
+
+        # Smart case: only match case when the search contains upper case
+        # letters, which also skips case folding for those searches
+        regex = QRegularExpression(QRegularExpression.escape(text))
+        if text == text.lower():
+            regex.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
+        regex.optimize()
+        self.proxy_model.setFilterRegularExpression(regex)
 
     @Slot(object)
     def _show_context_menu(self, position):
@@ -109,98 +259,79 @@ class FileExplorer(QWidget):
         index = self.tree_view.indexAt(position)
         if not index.isValid():
             return
+        index = self.proxy_model.mapToSource(index)
 
         path = self.model.filePath(index)
-        is_dir = os.path.isdir(path)
-
-        menu = QMenu()
-
-        # Common actions
-        open_action = QAction("Open" if not is_dir else "Open Folder", self)
-
-        # File-specific actions
-        compare_action = None
-        if not is_dir:
-            compare_action = QAction("Compare With...", self)
+        is_dir = self.model.isDir(index)
 
-        rename_action = QAction("Rename", self)
-        delete_action = QAction("Delete", self)
-
-        # Directory-specific actions
-        new_file_action = None
-        new_folder_action = None
-        if is_dir:
-            new_file_action = QAction("New File", self)
-            new_folder_action = QAction("New Folder", self)
-            menu.addAction(new_file_action)
-            menu.addAction(new_folder_action)
-            menu.addSeparator()
-
-        menu.addAction(open_action)
-
-        # Add compare action for files
-        if compare_action:
-            menu.addAction(compare_action)
-
-        menu.addAction(rename_action)
-        menu.addAction(delete_action)
+        # Show the actions that apply to this item
+        self._open_action.setText("Open Folder" if is_dir else "Open")
+        self._compare_action.setVisible(not is_dir)
+        self._new_file_action.setVisible(is_dir)
+        self._new_folder_action.setVisible(is_dir)
+        self._menu_separator.setVisible(is_dir)
 
         # Show menu and handle action
-        action = menu.exec_(self.tree_view.viewport().mapToGlobal(position))
+        action = self._menu.exec_(self.tree_view.viewport().mapToGlobal(position))
 
-        if action == open_action:
+        if action == self._open_action:
             if is_dir:
                 self.set_root_path(path)
             else:
                 self.file_activated.emit(path)
-        elif action == rename_action:
+        elif action == self._rename_action:
             self._rename_item(index)
-        elif action == delete_action:
+        elif action == self._delete_action:
             self._delete_item(index)
-        elif new_file_action and action == new_file_action:
+        elif action == self._new_file_action:
             self._create_new_file(path)
-        elif new_folder_action and action == new_folder_action:
+        elif action == self._new_folder_action:
             self._create_new_folder(path)
-        elif compare_action and action == compare_action:
+        elif action == self._compare_action:
             self._compare_with_file(path)
 
     def _rename_item(self, index):
         """Rename a file or folder"""
-        path = self.model.filePath(index)
-        name = os.path.basename(path)
-        parent_dir = os.path.dirname(path)
+        name = self.model.fileName(index)
 
         new_name, ok = QInputDialog.getText(
             self, "Rename", "New name:", text=name
         )
 
-        if ok and new_name:
-            new_path = os.path.join(parent_dir, new_name)
-            try:
-                os.rename(path, new_path)
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not rename: {str(e)}")
+        # Rename through the model so its cached entries stay in sync
+        if ok and new_name and new_name != name:
+            if not self.model.setData(index, new_name, Qt.EditRole):
+                QMessageBox.critical(self, "Error", f"Could not rename '{name}' to '{new_name}'")
 
     def _delete_item(self, index):
         """Delete a file or folder"""
-        path = self.model.filePath(index)
-        name = os.path.basename(path)
+        info = self.model.fileInfo(index)
+        path = info.absoluteFilePath()
+        name = info.fileName()
 
-        msg_box = QMessageBox()
-        msg_box.setIcon(QMessageBox.Warning)
-        msg_box.setText(f"Are you sure you want to delete '{name}'?")
-        msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
-        msg_box.setDefaultButton(QMessageBox.No)
+        reply = QMessageBox.question(
+            self, "Delete", f"Are you sure you want to delete '{name}'?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
 
-        if msg_box.exec_() == QMessageBox.Yes:
-            try:
-                if os.path.isdir(path):
-                    import shutil
-                    shutil.rmtree(path)
-                else:
-                    os.remove(path)
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not delete: {str(e)}")
+        if reply == QMessageBox.Yes:
+            if info.isDir():
+                # Large trees can take a long time, delete them off the GUI thread
+                task = _DeleteTreeTask(path)
+                task.signals.finished.connect(self._on_delete_finished)
+                QThreadPool.globalInstance().start(task)
+                return
+
+            # Remove through the model so the row goes away immediately
+            # instead of waiting for the file system watcher
+            if not self.model.remove(index):
+                QMessageBox.critical(self, "Error", f"Could not delete '{name}'")
+
+    @Slot(str, str)
+    def _on_delete_finished(self, path, error):
+        """Report the result of a background delete"""
+        if error:
+            QMessageBox.critical(self, "Error", f"Could not delete: {error}")
 
     def _create_new_file(self, directory):
         """Create a new file in the specified directory"""
@@ -209,11 +340,14 @@ class FileExplorer(QWidget):
         )
 
         if ok and file_name:
-            file_path = os.path.join(directory, file_name)
+            file_path = QDir(directory).filePath(file_name)
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write("")
+                # Create the empty file directly, failing if it already exists
+                fd = os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0), 0o644)
+                os.close(fd)
                 self.file_activated.emit(file_path)
+            except FileExistsError:
+                QMessageBox.critical(self, "Error", f"A file named '{file_name}' already exists.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not create file: {str(e)}")
 
@@ -224,11 +358,11 @@ class FileExplorer(QWidget):
         )
 
         if ok and folder_name:
-            folder_path = os.path.join(directory, folder_name)
-            try:
-                os.makedirs(folder_path)
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not create folder: {str(e)}")
+            qdir = QDir(directory)
+            if qdir.exists(folder_name):
+                QMessageBox.critical(self, "Error", f"A folder named '{folder_name}' already exists.")
+            elif not qdir.mkpath(folder_name):
+                QMessageBox.critical(self, "Error", f"Could not create folder '{folder_name}'")
 
     def _compare_with_file(self, file_path):
         """Open file comparison dialog"""
@@ -7,35 +7,219 @@ Provides the main application window with docking, menus, and toolbars.
 """
 
 import os
+import stat
+import shutil
+import logging
+from contextlib import contextmanager
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QMainWindow, QDockWidget, QToolBar, QStatusBar,
     QWidget, QSplitter, QFileDialog, QMenuBar, QMessageBox,
-    QVBoxLayout, QHBoxLayout, QLabel
+    QVBoxLayout, QHBoxLayout, QLabel, QApplication
 )
-from PySide6.QtCore import Qt, QSize, QSettings, Signal, Slot
-from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtCore import (
+    Qt, QSize, QSettings, QTimer, QEvent, Signal, Slot, QObject, QRunnable, QThreadPool
+)
+from PySide6.QtGui import QAction, QKeySequence, QIcon
+
+logger = logging.getLogger(__name__)
+
+# UI components are imported where they are first needed, so modules such as
+# the editor (and Pygments) are only loaded once a file is actually opened
+
+# Interval for coalescing cursor position updates in the status bar, in milliseconds
+CURSOR_UPDATE_DELAY = 16
+
+# Suffix of the hidden file a save is written to before it replaces the target
+SAVE_TEMP_SUFFIX = ".mcpide-save"
+
+# How long closing the window waits for saves still running, in milliseconds
+SAVE_WAIT_TIMEOUT = 5000
+
+@lru_cache(maxsize=512)
+def _basename(path):
+    """Get the file name of a path for tab titles, cached per path"""
+    return os.path.basename(path)
+
+class _WelcomePlaceholder(QWidget):
+    """Empty stand-in for the welcome tab until it is first shown"""
+    shown = Signal()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.shown.emit()
+
+class _FileLoadSignals(QObject):
+    """Signals for the background file load task"""
+    finished = Signal(int, str, object)  # request id, file path, text (None on error)
+
+class _FileLoadTask(QRunnable):
+    """Reads a text file on a thread pool thread"""
+    def __init__(self, request_id, file_path):
+        super().__init__()
+        self.request_id = request_id
+        self.file_path = file_path
+        self.signals = _FileLoadSignals()
 
-from src.ui.file_explorer import FileExplorer
-from src.ui.editor import CodeEditor
-from src.ui.theme_manager import ThemeManager
-from src.ui.welcome_screen import WelcomeScreen
-from src.ui.split_view import SplitViewContainer
-from src.ui.search_dialog import SearchDialog
+    def run(self):
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except Exception:
+            # Binary or unreadable file
+            text = None
+        self.signals.finished.emit(self.request_id, self.file_path, text)
+
+def _write_file_atomic(file_path, text):
+    """Write text to a temporary file next to a file, then move it into place"""
+    # Write through symlinks instead of replacing them
+    target = os.path.realpath(file_path)
+    directory, name = os.path.split(target)
+    temp_path = os.path.join(directory, f".{name}{SAVE_TEMP_SUFFIX}")
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        # Keep the permissions of the file being replaced
+        try:
+            shutil.copymode(target, temp_path)
+        except OSError:
+            pass
+
+        os.replace(temp_path, target)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+class _FileSaveSignals(QObject):
+    """Signals for the background file save task"""
+    finished = Signal(int, bool)  # request id, success
+
+class _FileSaveTask(QRunnable):
+    """Writes a text file on a thread pool thread"""
+    def __init__(self, request_id, file_path, text):
+        super().__init__()
+        self.request_id = request_id
+        self.file_path = file_path
+        self.text = text
+        self.signals = _FileSaveSignals()
+
+    def run(self):
+        try:
+            _write_file_atomic(self.file_path, self.text)
+            success = True
+        except Exception:
+            logger.warning("Could not save %s", self.file_path, exc_info=True)
+            success = False
+        self.signals.finished.emit(self.request_id, success)
+
+class _DirectoryCheckSignals(QObject):
+    """Signals for the background directory check task"""
+    finished = Signal(str, bool)  # path, is an existing directory
+
+class _DirectoryCheckTask(QRunnable):
+    """Checks whether a path is a directory on a thread pool thread"""
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.signals = _DirectoryCheckSignals()
+
+    def run(self):
+        self.signals.finished.emit(self.path, os.path.isdir(self.path))
 
 class MainWindow(QMainWindow):
     """
     Main application window for McpIDE
     """
+    # Menu and toolbar actions: (attribute, label, shortcut, slot name)
+    _ACTIONS = (
+        # File actions
+        ("new_file_action", "New File", QKeySequence.New, "new_file"),
+        ("open_file_action", "Open File...", QKeySequence.Open, "open_file"),
+        ("open_folder_action", "Open Folder...", "Ctrl+Shift+O", "open_folder"),
+        ("compare_files_action", "Compare Files...", "Ctrl+Alt+C", "compare_files"),
+        ("save_action", "Save", QKeySequence.Save, "save_file"),
+        ("save_as_action", "Save As...", QKeySequence.SaveAs, "save_file_as"),
+        ("exit_action", "Exit", QKeySequence.Quit, "close"),
+
+        # Edit actions
+        ("undo_action", "Undo", QKeySequence.Undo, "undo"),
+        ("redo_action", "Redo", QKeySequence.Redo, "redo"),
+        ("cut_action", "Cut", QKeySequence.Cut, "cut"),
+        ("copy_action", "Copy", QKeySequence.Copy, "copy"),
+        ("paste_action", "Paste", QKeySequence.Paste, "paste"),
+        ("find_action", "Find", QKeySequence.Find, "find"),
+        ("replace_action", "Replace", "Ctrl+H", "replace"),
+
+        # View actions
+        ("toggle_explorer_action", "Explorer", None, "toggle_explorer"),
+        ("split_horizontal_action", "Split Horizontally", "Ctrl+\\", "split_horizontal"),
+        ("split_vertical_action", "Split Vertically", "Ctrl+Shift+\\", "split_vertical"),
+        ("toggle_theme_action", "Toggle Theme", None, "toggle_theme"),
+
+        # Help actions
+        ("about_action", "About", None, "show_about"),
+    )
+
+    # Theme icon names for actions, loaded when the window is first shown
+    _ACTION_ICONS = (
+        ("new_file_action", "document-new"),
+        ("open_file_action", "document-open"),
+        ("save_action", "document-save"),
+        ("save_as_action", "document-save-as"),
+        ("undo_action", "edit-undo"),
+        ("redo_action", "edit-redo"),
+        ("cut_action", "edit-cut"),
+        ("copy_action", "edit-copy"),
+        ("paste_action", "edit-paste"),
+        ("find_action", "edit-find"),
+        ("replace_action", "edit-find-replace"),
+        ("exit_action", "application-exit"),
+    )
+
     def __init__(self, settings):
         super().__init__()
         self.settings = settings
 
+        # Files being read in the background, keyed by request id in the
+        # order they were requested, and the results not added yet
+        self._next_load_id = 0
+        self._pending_loads = {}
+        self._load_results = {}
+
+        # Files being written in the background, keyed by request id. Saves
+        # run one at a time so saves of the same file finish in order
+        self._next_save_id = 0
+        self._pending_saves = {}
+        self._save_pool = QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
+
+        # Request id and path of each editor's latest save, so saving again
+        # before a Save As finished goes to the new path
+        self._latest_saves = {}
+
+        # Action icons are looked up on the first show, see showEvent
+        self._icons_loaded = False
+
+        # Editor whose cursor position is shown in the status bar
+        self._cursor_editor = None
+
+        # Search dialog, created on first use
+        self._search_dialog = None
+
+        # Window geometry and open files, read and written through one instance
+        self._qsettings = QSettings()
+
         # Set window properties
         self.setObjectName("MainWindow")
         self.setWindowTitle("McpIDE")
         self.setMinimumSize(800, 600)
 
         # Create theme manager
+        from src.ui.theme_manager import ThemeManager
         self.theme_manager = ThemeManager(settings)
 
         # Initialize UI components
@@ -48,23 +232,23 @@ class MainWindow(QMainWindow):
         # Connect signals
         self._connect_signals()
 
-        # Set object names for all widgets to ensure proper state saving
-        self._set_object_names()
-
         # Apply theme
         self.theme_manager.apply_theme(self.settings.get_theme())
 
         # Restore window state if available
         self._restore_window_state()
 
-        # Open last workspace if available
-        self._open_last_workspace()
+        # Open last workspace if available, once the window has painted
+        QTimer.singleShot(0, self._open_last_workspace)
 
-        # Restore open files
-        self._restore_open_files()
+        # Restore open files once the window has painted
+        QTimer.singleShot(0, self._restore_open_files)
 
     def _setup_ui(self):
         """Set up the UI components"""
+        from src.ui.file_explorer import FileExplorer
+        from src.ui.split_view import SplitViewContainer
+
         # Central widget
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -90,20 +274,45 @@ class MainWindow(QMainWindow):
         self.main_splitter.addWidget(self.split_view_container)
 
         # Get the editor tabs from the split view container
-        self.editor_tabs = next(iter(self.split_view_container.editor_tabs.values()))
+        self.editor_tabs = self.split_view_container.primary_tabs
+        self.editor_tabs.setObjectName("editor_tabs")
 
         # Connect split view container signals
-        self.split_view_container.editor_created.connect(self._on_editor_created)
-        self.split_view_container.editor_closed.connect(self._on_editor_closed)
         self.split_view_container.current_editor_changed.connect(self._on_current_editor_changed)
         self.split_view_container.file_dropped.connect(self._open_file)
 
         # Add welcome tab if needed
+        self.welcome_screen = None
+        self._welcome_placeholder = None
         if self.settings.should_show_welcome_screen() and not self.settings.is_welcome_tab_closed():
             self._add_welcome_tab()
 
     def _add_welcome_tab(self):
-        """Add a welcome tab to the editor"""
+        """Add a welcome tab to the editor, built when it is first shown"""
+        self._welcome_placeholder = _WelcomePlaceholder()
+        self._welcome_placeholder.shown.connect(self._create_welcome_screen, Qt.QueuedConnection)
+
+        # Add to the first tab widget in the split view container
+        self.editor_tabs.addTab(self._welcome_placeholder, "Welcome")
+
+    @Slot()
+    def _create_welcome_screen(self):
+        """Replace the welcome placeholder tab with the real welcome screen"""
+        placeholder = self._welcome_placeholder
+        if placeholder is None:
+            return
+        self._welcome_placeholder = None
+
+        # Find the placeholder, it may have moved to another split
+        for tabs in self.split_view_container.editor_tabs.values():
+            index = tabs.indexOf(placeholder)
+            if index >= 0:
+                break
+        else:
+            # The welcome tab was closed
+            return
+
+        from src.ui.welcome_screen import WelcomeScreen
         self.welcome_screen = WelcomeScreen(self.settings, self.theme_manager)
 
         # Connect welcome screen signals
@@ -111,79 +320,34 @@ class MainWindow(QMainWindow):
         self.welcome_screen.open_folder_requested.connect(self.open_folder)
         self.welcome_screen.recent_workspace_selected.connect(self._open_recent_workspace)
 
-        # Add to the first tab widget in the split view container
-        self.editor_tabs.addTab(self.welcome_screen, "Welcome")
+        is_current = tabs.currentIndex() == index
+        tabs.removeTab(index)
+        tabs.insertTab(index, self.welcome_screen, "Welcome")
+        if is_current:
+            tabs.setCurrentIndex(index)
+        placeholder.deleteLater()
 
     def _create_actions(self):
         """Create actions for menus and toolbars"""
-        # File actions
-        self.new_file_action = QAction("New File", self)
-        self.new_file_action.setShortcut(QKeySequence.New)
-
-        self.open_file_action = QAction("Open File...", self)
-        self.open_file_action.setShortcut(QKeySequence.Open)
-
-        self.open_folder_action = QAction("Open Folder...", self)
-        self.open_folder_action.setShortcut("Ctrl+Shift+O")
-
-        self.compare_files_action = QAction("Compare Files...", self)
-        self.compare_files_action.setShortcut("Ctrl+Alt+C")
-
-        self.save_action = QAction("Save", self)
-        self.save_action.setShortcut(QKeySequence.Save)
-
-        self.save_as_action = QAction("Save As...", self)
-        self.save_as_action.setShortcut(QKeySequence.SaveAs)
-
-        self.exit_action = QAction("Exit", self)
-        self.exit_action.setShortcut(QKeySequence.Quit)
-
-        # Edit actions
-        self.undo_action = QAction("Undo", self)
-        self.undo_action.setShortcut(QKeySequence.Undo)
-
-        self.redo_action = QAction("Redo", self)
-        self.redo_action.setShortcut(QKeySequence.Redo)
-
-        self.cut_action = QAction("Cut", self)
-        self.cut_action.setShortcut(QKeySequence.Cut)
+        for attr, label, shortcut, _ in self._ACTIONS:
+            action = QAction(label, self)
+            if shortcut is not None:
+                action.setShortcut(shortcut)
+            setattr(self, attr, action)
 
-        self.copy_action = QAction("Copy", self)
-        self.copy_action.setShortcut(QKeySequence.Copy)
-
-        self.paste_action = QAction("Paste", self)
-        self.paste_action.setShortcut(QKeySequence.Paste)
-
-        self.find_action = QAction("Find", self)
-        self.find_action.setShortcut(QKeySequence.Find)
-
-        self.replace_action = QAction("Replace", self)
-        self.replace_action.setShortcut(QKeySequence("Ctrl+H"))
-
-        # View actions
-        self.toggle_explorer_action = QAction("Explorer", self)
         self.toggle_explorer_action.setCheckable(True)
         self.toggle_explorer_action.setChecked(True)
 
-        self.split_horizontal_action = QAction("Split Horizontally", self)
-        self.split_horizontal_action.setShortcut("Ctrl+\\")
-
-        self.split_vertical_action = QAction("Split Vertically", self)
-        self.split_vertical_action.setShortcut("Ctrl+Shift+\\")
-
-        self.toggle_theme_action = QAction("Toggle Theme", self)
-
-        # Help actions
-        self.about_action = QAction("About", self)
-
     def _create_menus(self):
         """Create menus for the main window"""
         # Menu bar
         self.menu_bar = QMenuBar()
+        self.menu_bar.setObjectName("menu_bar")
         self.setMenuBar(self.menu_bar)
 
         # File menu
         self.file_menu = self.menu_bar.addMenu("File")
+        self.file_menu.setObjectName("file_menu")
         self.file_menu.addAction(self.new_file_action)
         self.file_menu.addAction(self.open_file_action)
         self.file_menu.addAction(self.open_folder_action)
@@ -194,8 +358,31 @@ class MainWindow(QMainWindow):
         self.file_menu.addSeparator()
         self.file_menu.addAction(self.exit_action)
 
-        # Edit menu
+        # Edit, View and Help menus are filled when first opened
         self.edit_menu = self.menu_bar.addMenu("Edit")
+        self.edit_menu.setObjectName("edit_menu")
+        self.edit_menu.aboutToShow.connect(self._populate_edit_menu)
+
+        self.view_menu = self.menu_bar.addMenu("View")
+        self.view_menu.setObjectName("view_menu")
+        self.view_menu.aboutToShow.connect(self._populate_view_menu)
+
+        self.help_menu = self.menu_bar.addMenu("Help")
+        self.help_menu.setObjectName("help_menu")
+        self.help_menu.aboutToShow.connect(self._populate_help_menu)
+
+        # Their shortcuts have to work before the menus are ever opened
+        self.addActions([
+            self.undo_action, self.redo_action,
+            self.cut_action, self.copy_action, self.paste_action,
+            self.find_action, self.replace_action,
+            self.split_horizontal_action, self.split_vertical_action,
+        ])
+
+    @Slot()
+    def _populate_edit_menu(self):
+        """Add the actions to the Edit menu the first time it is shown"""
+        self.edit_menu.aboutToShow.disconnect(self._populate_edit_menu)
         self.edit_menu.addAction(self.undo_action)
         self.edit_menu.addAction(self.redo_action)
         self.edit_menu.addSeparator()
@@ -206,8 +393,10 @@ class MainWindow(QMainWindow):
         self.edit_menu.addAction(self.find_action)
         self.edit_menu.addAction(self.replace_action)
 
-        # View menu
-        self.view_menu = self.menu_bar.addMenu("View")
+    @Slot()
+    def _populate_view_menu(self):
+        """Add the actions to the View menu the first time it is shown"""
+        self.view_menu.aboutToShow.disconnect(self._populate_view_menu)
         self.view_menu.addAction(self.toggle_explorer_action)
         self.view_menu.addSeparator()
 
@@ -219,8 +408,10 @@ class MainWindow(QMainWindow):
         self.view_menu.addSeparator()
         self.view_menu.addAction(self.toggle_theme_action)
 
-        # Help menu
-        self.help_menu = self.menu_bar.addMenu("Help")
+    @Slot()
+    def _populate_help_menu(self):
+        """Add the actions to the Help menu the first time it is shown"""
+        self.help_menu.aboutToShow.disconnect(self._populate_help_menu)
         self.help_menu.addAction(self.about_action)
 
     def _create_toolbars(self):
@@ -246,123 +437,142 @@ class MainWindow(QMainWindow):
     def _create_statusbar(self):
         """Create status bar for the main window"""
         self.status_bar = QStatusBar()
+        self.status_bar.setObjectName("status_bar")
         self.setStatusBar(self.status_bar)
 
         # Add permanent widgets
         self.cursor_position_label = QLabel("Line: 1, Column: 1")
         self.status_bar.addPermanentWidget(self.cursor_position_label)
 
+        # Rapid cursor moves are collapsed into one label update
+        self._last_cursor_position = (1, 1)
+        self._pending_cursor_position = (1, 1)
+        self._cursor_timer = QTimer(self)
+        self._cursor_timer.setSingleShot(True)
+        self._cursor_timer.setInterval(CURSOR_UPDATE_DELAY)
+        self._cursor_timer.timeout.connect(self._show_cursor_position)
+
         self.status_bar.showMessage("Ready")
 
     def _connect_signals(self):
         """Connect signals to slots"""
-        # File actions
-        self.new_file_action.triggered.connect(self.new_file)
-        self.open_file_action.triggered.connect(self.open_file)
-        self.open_folder_action.triggered.connect(self.open_folder)
-        self.compare_files_action.triggered.connect(self.compare_files)
-        self.save_action.triggered.connect(self.save_file)
-        self.save_as_action.triggered.connect(self.save_file_as)
-        self.exit_action.triggered.connect(self.close)
-
-        # Edit actions
-        self.undo_action.triggered.connect(self.undo)
-        self.redo_action.triggered.connect(self.redo)
-        self.cut_action.triggered.connect(self.cut)
-        self.copy_action.triggered.connect(self.copy)
-        self.paste_action.triggered.connect(self.paste)
-        self.find_action.triggered.connect(self.find)
-        self.replace_action.triggered.connect(self.replace)
-
-        # View actions
-        self.toggle_explorer_action.triggered.connect(self.toggle_explorer)
-        self.split_horizontal_action.triggered.connect(self.split_horizontal)
-        self.split_vertical_action.triggered.connect(self.split_vertical)
-        self.toggle_theme_action.triggered.connect(self.toggle_theme)
-
-        # Help actions
-        self.about_action.triggered.connect(self.show_about)
+        # Menu and toolbar actions
+        for attr, _, _, slot in self._ACTIONS:
+            getattr(self, attr).triggered.connect(getattr(self, slot))
 
         # File explorer
         self.file_explorer.file_activated.connect(self._open_file)
         self.file_explorer.compare_files_requested.connect(self.compare_files_paths)
 
-        # Settings
-        self.settings.theme_changed.connect(self.theme_manager.apply_theme)
-
-    def _set_object_names(self):
-        """Set object names for all widgets to ensure proper state saving"""
-        # Main window components
-        self.file_explorer_dock.setObjectName("file_explorer_dock")
-        self.main_toolbar.setObjectName("main_toolbar")
-        self.editor_tabs.setObjectName("editor_tabs")
-        self.status_bar.setObjectName("status_bar")
-        self.menu_bar.setObjectName("menu_bar")
+        # An editor in another split becomes current when it gets focus
+        QApplication.instance().focusChanged.connect(self._on_focus_changed)
 
-        # Menus
-        self.file_menu.setObjectName("file_menu")
-        self.edit_menu.setObjectName("edit_menu")
-        self.view_menu.setObjectName("view_menu")
-        self.help_menu.setObjectName("help_menu")
+        # Settings, the theme manager lives as long as the settings so it
+        # can use the direct callback instead of a signal connection
+        self.settings.subscribe("theme", self.theme_manager.apply_theme)
 
     def _restore_window_state(self):
         """Restore window state from settings"""
         try:
-            qsettings = QSettings()
-            if qsettings.contains("mainwindow/geometry"):
-                self.restoreGeometry(qsettings.value("mainwindow/geometry"))
-            if qsettings.contains("mainwindow/state"):
-                self.restoreState(qsettings.value("mainwindow/state"))
-        except Exception as e:
-            print(f"Warning: Could not restore window state: {str(e)}")
+            self._qsettings.beginGroup("mainwindow")
+            try:
+                geometry = self._qsettings.value("geometry", None)
+                state = self._qsettings.value("state", None)
+            finally:
+                self._qsettings.endGroup()
+
+            if geometry is not None:
+                self.restoreGeometry(geometry)
+            if state is not None:
+                self.restoreState(state)
+        except Exception:
+            logger.warning("Could not restore window state", exc_info=True)
+
+    def showEvent(self, event):
+        """Handle window show event"""
+        super().showEvent(event)
+
+        # Icon theme lookups are slow, keep them out of window construction
+        if not self._icons_loaded:
+            self._icons_loaded = True
+            self._load_action_icons()
+
+    def _load_action_icons(self):
+        """Set theme icons on the actions, where the icon theme has them"""
+        for attr, icon_name in self._ACTION_ICONS:
+            icon = QIcon.fromTheme(icon_name)
+            if not icon.isNull():
+                getattr(self, attr).setIcon(icon)
 
     def closeEvent(self, event):
         """Handle window close event"""
+        # Let saves still running finish and apply their results first
+        if self._pending_saves:
+            self.status_bar.showMessage("Waiting for files to be saved...")
+            if not self._save_pool.waitForDone(SAVE_WAIT_TIMEOUT):
+                response = QMessageBox.question(
+                    self,
+                    "Saving Files",
+                    "Some files are still being saved. Do you want to close anyway?",
+                    QMessageBox.Yes | QMessageBox.No
+                )
+                if response != QMessageBox.Yes:
+                    event.ignore()
+                    return
+            QApplication.sendPostedEvents(self, QEvent.MetaCall)
+
+        # One pass over the tabs for both the saved file list and the
+        # unsaved changes check
+        open_files, has_welcome_tab, modified_editors = self._collect_open_tabs()
+
         try:
             # Save window state
-            qsettings = QSettings()
-            qsettings.setValue("mainwindow/geometry", self.saveGeometry())
-            qsettings.setValue("mainwindow/state", self.saveState())
+            self._qsettings.beginGroup("mainwindow")
+            self._qsettings.setValue("geometry", self.saveGeometry())
+            self._qsettings.setValue("state", self.saveState())
+            self._qsettings.endGroup()
 
             # Save open files
-            self._save_open_files()
-        except Exception as e:
-            print(f"Warning: Could not save window state: {str(e)}")
-
-        # Check for unsaved changes in all editors
-        editors = self.split_view_container.get_all_editors()
-        for editor in editors:
-            if hasattr(editor, 'document') and editor.document().isModified():
-                file_name = "Untitled"
-                if hasattr(editor, 'file_path') and editor.file_path:
-                    file_name = os.path.basename(editor.file_path)
+            self._save_open_files(open_files, has_welcome_tab)
 
-                response = QMessageBox.question(
-                    self,
-                    "Unsaved Changes",
-                    f"There are unsaved changes in '{file_name}'. Do you want to save them before closing?",
-                    QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel
-                )
+            # Write everything to the backend at once
+            self._qsettings.sync()
+        except Exception:
+            logger.warning("Could not save window state", exc_info=True)
 
-                if response == QMessageBox.Save:
-                    # Make this editor the current one
-                    self.split_view_container.add_editor(editor, file_name)
-                    if not self.save_file():
-                        event.ignore()
-                        return
-                elif response == QMessageBox.Cancel:
+        # Check for unsaved changes in all editors
+        for editor in modified_editors:
+            file_name = "Untitled"
+            if hasattr(editor, 'file_path') and editor.file_path:
+                file_name = _basename(editor.file_path)
+
+            response = QMessageBox.question(
+                self,
+                "Unsaved Changes",
+                f"There are unsaved changes in '{file_name}'. Do you want to save them before closing?",
+                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel
+            )
+
+            if response == QMessageBox.Save:
+                if not self._save_editor_now(editor):
                     event.ignore()
                     return
+            elif response == QMessageBox.Cancel:
+                event.ignore()
+                return
 
         event.accept()
 
+    def _create_editor(self):
+        """Create a code editor connected to the main window"""
+        from src.ui.editor import CodeEditor
+        # The cursor position signal is only connected while the editor is current
+        return CodeEditor(self.settings, self.theme_manager)
+
     @Slot()
     def new_file(self):
         """Create a new file"""
-        editor = CodeEditor(self.settings, self.theme_manager)
-
-        # Connect editor signals
-        editor.cursor_position_changed.connect(self._update_cursor_position)
+        editor = self._create_editor()
 
         # Add to split view container
         self.split_view_container.add_editor(editor, "Untitled")
@@ -377,58 +587,100 @@ class MainWindow(QMainWindow):
         if file_path:
             self._open_file(file_path)
 
-    def _open_file(self, file_path):
-        """Open a file in the editor"""
-        # Validate file path
-        if not file_path or not os.path.exists(file_path) or not os.path.isfile(file_path):
+    @Slot(str)
+    def _open_file(self, file_path, validated=False):
+        """Open a file in the editor, validated skips the check that it is a file"""
+        # Validate file path, isfile also covers the file not existing
+        if not validated and (not file_path or not os.path.isfile(file_path)):
             QMessageBox.critical(self, "Error", f"File does not exist: {file_path}")
             return
 
         # Check if file is already open
         editor = self.split_view_container.get_editor_by_path(file_path)
         if editor:
-            # Find the tab widget containing this editor
-            for tab_id, tabs in self.split_view_container.editor_tabs.items():
-                for i in range(tabs.count()):
-                    if tabs.widget(i) == editor:
-                        tabs.setCurrentIndex(i)
-                        return
-
-        # Create a new editor
-        editor = CodeEditor(self.settings, self.theme_manager)
-
-        # Connect editor signals
-        editor.cursor_position_changed.connect(self._update_cursor_position)
-
-        # Load the file
-        if editor.load_file(file_path):
-            file_name = os.path.basename(file_path)
-
-            # Check if we have a specific target tab widget from a drop
-            target_tab_widget = self.split_view_container.get_last_drop_target()
-            drop_index = self.split_view_container._last_drop_index
-
-            if target_tab_widget and target_tab_widget in self.split_view_container.editor_tabs.values():
-                # Add to the specific tab widget that received the drop
-                index = self.split_view_container.add_editor(editor, file_name, target_tab_widget)
-
-                # If we have a specific drop index, move the tab to that position
-                if drop_index >= 0 and drop_index < target_tab_widget.count():
-                    # Move the newly added tab to the drop index
-                    target_tab_widget.tabBar().moveTab(target_tab_widget.count() - 1, drop_index)
-                    target_tab_widget.setCurrentIndex(drop_index)
-            else:
-                # Add to the active tab widget
-                self.split_view_container.add_editor(editor, file_name)
-
-            # Reset the last drop target and index
-            self.split_view_container._last_drop_target = None
-            self.split_view_container._last_drop_index = -1
-
-            self.status_bar.showMessage(f"Opened {file_path}")
-        else:
+            # Switch to the tab containing this editor
+            tabs, index = self.split_view_container.find_editor_tab(editor)
+            if tabs is not None:
+                tabs.setCurrentIndex(index)
+                return
+
+        # Already being loaded
+        for pending_path, _, _ in self._pending_loads.values():
+            if pending_path == file_path:
+                return
+
+        # Remember where a dropped file should go, then read it in the
+        # background so slow disks don't freeze the window
+        request_id = self._next_load_id
+        self._next_load_id += 1
+        self._pending_loads[request_id] = (
+            file_path,
+            self.split_view_container.get_last_drop_target(),
+            self.split_view_container._last_drop_index
+        )
+
+        # Reset the last drop target and index
+        self.split_view_container._last_drop_target = None
+        self.split_view_container._last_drop_index = -1
+
+        task = _FileLoadTask(request_id, file_path)
+        task.signals.finished.connect(self._on_file_loaded)
+        QThreadPool.globalInstance().start(task)
+
+    @Slot(int, str, object)
+    def _on_file_loaded(self, request_id, file_path, text):
+        """Queue a file read in the background to be added to the editor"""
+        if request_id not in self._pending_loads:
+            return
+        self._load_results[request_id] = text
+
+        # Add the files read during this event loop pass in one batch
+        QTimer.singleShot(0, self._add_loaded_files)
+
+    @Slot()
+    def _add_loaded_files(self):
+        """Add editors for loaded files, in the order they were requested"""
+        if not self._pending_loads or next(iter(self._pending_loads)) not in self._load_results:
+            return
+
+        failed = []
+        with self._batched_ui():
+            for request_id in list(self._pending_loads):
+                if request_id not in self._load_results:
+                    # Keep the tab order, wait for the earlier file
+                    break
+                file_path, target_tab_widget, drop_index = self._pending_loads.pop(request_id)
+                text = self._load_results.pop(request_id)
+                if text is None:
+                    failed.append(file_path)
+                else:
+                    self._add_file_editor(file_path, text, target_tab_widget, drop_index)
+
+        for file_path in failed:
             QMessageBox.critical(self, "Error", f"Could not open file: {file_path}")
 
+    def _add_file_editor(self, file_path, text, target_tab_widget, drop_index):
+        """Create an editor for a file's content and add it to a tab widget"""
+        editor = self._create_editor()
+        editor.set_file_content(file_path, text)
+        file_name = _basename(file_path)
+
+        # Check if we have a specific target tab widget from a drop
+        if target_tab_widget and target_tab_widget in self.split_view_container.editor_tabs.values():
+            # Add to the specific tab widget that received the drop
+            index = self.split_view_container.add_editor(editor, file_name, target_tab_widget)
+
+            # If we have a specific drop index, move the tab to that position
+            if drop_index >= 0 and drop_index < target_tab_widget.count():
+                # Move the newly added tab to the drop index
+                target_tab_widget.tabBar().moveTab(target_tab_widget.count() - 1, drop_index)
+                target_tab_widget.setCurrentIndex(drop_index)
+        else:
+            # Add to the active tab widget
+            self.split_view_container.add_editor(editor, file_name)
+
+        self.status_bar.showMessage(f"Opened {file_path}")
+
     @Slot()
     def open_folder(self):
         """Open a folder as workspace"""
@@ -439,14 +691,16 @@ class MainWindow(QMainWindow):
         if folder_path:
             self._open_workspace(folder_path)
 
-    def _open_workspace(self, folder_path):
-        """Open a workspace folder"""
-        if os.path.exists(folder_path) and os.path.isdir(folder_path):
+    @Slot(str)
+    def _open_workspace(self, folder_path, validated=False):
+        """Open a workspace folder, validated skips the check that it is a directory"""
+        if validated or os.path.isdir(folder_path):
             self.file_explorer.set_root_path(folder_path)
             self.settings.add_recent_workspace(folder_path)
             self.status_bar.showMessage(f"Opened workspace: {folder_path}")
             self.setWindowTitle(f"McpIDE - {folder_path}")
 
+    @Slot(str)
     def _open_recent_workspace(self, folder_path):
         """Open a recent workspace"""
         self._open_workspace(folder_path)
@@ -454,8 +708,18 @@ class MainWindow(QMainWindow):
     def _open_last_workspace(self):
         """Open the last workspace if available"""
         last_workspace = self.settings.get_last_workspace()
-        if last_workspace and os.path.exists(last_workspace) and os.path.isdir(last_workspace):
-            self._open_workspace(last_workspace)
+        if last_workspace:
+            # The workspace may be on a slow or missing network drive,
+            # check it off the GUI thread
+            task = _DirectoryCheckTask(last_workspace)
+            task.signals.finished.connect(self._on_last_workspace_checked)
+            QThreadPool.globalInstance().start(task)
+
+    @Slot(str, bool)
+    def _on_last_workspace_checked(self, folder_path, is_dir):
+        """Open the last workspace once it is known to exist"""
+        if is_dir:
+            self._open_workspace(folder_path, validated=True)
 
     @Slot()
     def save_file(self):
@@ -464,23 +728,14 @@ class MainWindow(QMainWindow):
         if not editor:
             return False
 
-        if not hasattr(editor, 'file_path') or not editor.file_path:
+        # A Save As still being written decides the path
+        latest = self._latest_saves.get(editor)
+        file_path = latest[1] if latest else getattr(editor, 'file_path', None)
+        if not file_path:
             return self.save_file_as()
 
-        if editor.save_file():
-            # Update tab title to remove unsaved indicator
-            for tab_id, tabs in self.split_view_container.editor_tabs.items():
-                index = tabs.indexOf(editor)
-                if index >= 0:
-                    current_text = tabs.tabText(index)
-                    if current_text.endswith('*'):
-                        tabs.setTabText(index, current_text[:-1])
-
-            self.status_bar.showMessage(f"Saved {editor.file_path}")
-            return True
-        else:
-            QMessageBox.critical(self, "Error", f"Could not save file")
-            return False
+        self._start_save(editor, file_path)
+        return True
 
     @Slot()
     def save_file_as(self):
@@ -494,20 +749,82 @@ class MainWindow(QMainWindow):
         )
 
         if file_path:
-            if editor.save_file(file_path):
-                # Update tab title
-                for tab_id, tabs in self.split_view_container.editor_tabs.items():
-                    index = tabs.indexOf(editor)
-                    if index >= 0:
-                        tabs.setTabText(index, os.path.basename(file_path))
-
-                self.status_bar.showMessage(f"Saved {file_path}")
-                return True
-            else:
-                QMessageBox.critical(self, "Error", f"Could not save file")
-                return False
+            self._start_save(editor, file_path)
+            return True
         return False
 
+    def _start_save(self, editor, file_path):
+        """Write an editor's text to a file in the background"""
+        request_id = self._next_save_id
+        self._next_save_id += 1
+
+        # The text is taken now, the revision tells whether the editor
+        # was changed again before the save finished
+        self._pending_saves[request_id] = (editor, file_path, editor.document().revision())
+        self._latest_saves[editor] = (request_id, file_path)
+
+        task = _FileSaveTask(request_id, file_path, editor.text_for_save())
+        task.signals.finished.connect(self._on_file_saved)
+        self._save_pool.start(task)
+        self.status_bar.showMessage(f"Saving {file_path}...")
+
+    @Slot(int, bool)
+    def _on_file_saved(self, request_id, success):
+        """Update the editor once a background save finished"""
+        pending = self._pending_saves.pop(request_id, None)
+        if pending is None:
+            return
+        editor, file_path, revision = pending
+
+        latest = self._latest_saves.get(editor)
+        if latest is not None and latest[0] == request_id:
+            del self._latest_saves[editor]
+
+        if success:
+            self._on_editor_saved(editor, file_path, revision)
+        else:
+            QMessageBox.critical(self, "Error", f"Could not save file: {file_path}")
+
+    def _save_editor_now(self, editor):
+        """Save an editor before the window closes, asking for a path if it has none"""
+        file_path = getattr(editor, 'file_path', None)
+        if not file_path:
+            file_path, _ = QFileDialog.getSaveFileName(
+                self, "Save File As", "", "All Files (*)"
+            )
+            if not file_path:
+                return False
+
+        revision = editor.document().revision()
+        try:
+            _write_file_atomic(file_path, editor.text_for_save())
+        except Exception:
+            QMessageBox.critical(self, "Error", f"Could not save file: {file_path}")
+            return False
+
+        self._on_editor_saved(editor, file_path, revision)
+        return True
+
+    def _on_editor_saved(self, editor, file_path, revision):
+        """Mark an editor as saved, unless it changed after its text was taken"""
+        document = editor.document()
+        if document.revision() == revision:
+            # Clearing the modified state removes the unsaved indicator
+            document.setModified(False)
+
+        if file_path != editor.file_path:
+            editor.set_file_path(file_path)
+
+            # Update tab title
+            tabs, index = self.split_view_container.find_editor_tab(editor)
+            if tabs is not None:
+                title = _basename(file_path)
+                if document.isModified():
+                    title += '*'
+                tabs.setTabText(index, title)
+
+        self.status_bar.showMessage(f"Saved {file_path}")
+
     @Slot()
     def undo(self):
         """Undo the last action"""
@@ -546,31 +863,15 @@ class MainWindow(QMainWindow):
     @Slot()
     def find(self):
         """Find text in the current editor"""
-        editor = self.split_view_container.get_current_editor()
-        if not editor:
-            return
-
-        # Get selected text if any
-        selected_text = ""
-        cursor = editor.textCursor()
-        if cursor.hasSelection():
-            selected_text = cursor.selectedText()
-
-        # Create and show search dialog
-        dialog = SearchDialog(self, selected_text)
-
-        # Connect signals
-        dialog.find_next.connect(lambda text, case, whole, regex:
-                               editor.find_text(text, case, whole, regex, True))
-        dialog.find_previous.connect(lambda text, case, whole, regex:
-                                  editor.find_text(text, case, whole, regex, False))
-
-        # Show dialog
-        dialog.show()
+        self._show_search_dialog()
 
     @Slot()
     def replace(self):
         """Replace text in the current editor"""
+        self._show_search_dialog()
+
+    def _show_search_dialog(self):
+        """Show the search dialog, created on first use and reused after"""
         editor = self.split_view_container.get_current_editor()
         if not editor:
             return
@@ -581,25 +882,26 @@ class MainWindow(QMainWindow):
         if cursor.hasSelection():
             selected_text = cursor.selectedText()
 
-        # Create and show search dialog
-        dialog = SearchDialog(self, selected_text)
-
-        # Connect signals
-        dialog.find_next.connect(lambda text, case, whole, regex:
-                               editor.find_text(text, case, whole, regex, True))
-        dialog.find_previous.connect(lambda text, case, whole, regex:
-                                  editor.find_text(text, case, whole, regex, False))
-        dialog.replace.connect(lambda find_text, replace_text, case, whole, regex:
-                             editor.replace_text(find_text, replace_text, case, whole, regex))
-        dialog.replace_all.connect(lambda find_text, replace_text, case, whole, regex:
-                                self._on_replace_all(editor, find_text, replace_text, case, whole, regex))
+        if self._search_dialog is None:
+            # Create search dialog, closing it only hides it
+            from src.ui.search_dialog import SearchDialog
+            self._search_dialog = SearchDialog(self, editor, selected_text)
+            self._search_dialog.replaced_all.connect(self._on_replaced_all)
+        else:
+            self._search_dialog.set_editor(editor)
+            if selected_text:
+                self._search_dialog.search_line_edit.setText(selected_text)
+                self._search_dialog.search_line_edit.selectAll()
 
         # Show dialog
-        dialog.show()
-
-    def _on_replace_all(self, editor, find_text, replace_text, case_sensitive, whole_words, regex):
-        """Handle replace all action"""
-        count = editor.replace_all(find_text, replace_text, case_sensitive, whole_words, regex)
+        self._search_dialog.show()
+        self._search_dialog.raise_()
+        self._search_dialog.activateWindow()
+        self._search_dialog.search_line_edit.setFocus()
+
+    @Slot(int)
+    def _on_replaced_all(self, count):
+        """Show the number of replacements made by replace all"""
         self.status_bar.showMessage(f"Replaced {count} occurrences")
 
     @Slot()
@@ -629,7 +931,18 @@ class MainWindow(QMainWindow):
     @Slot(int, int)
     def _update_cursor_position(self, line, column):
         """Update cursor position in status bar"""
-        self.cursor_position_label.setText(f"Line: {line}, Column: {column}")
+        self._pending_cursor_position = (line, column)
+        if not self._cursor_timer.isActive():
+            self._cursor_timer.start()
+
+    @Slot()
+    def _show_cursor_position(self):
+        """Show the latest cursor position if it changed"""
+        position = self._pending_cursor_position
+        if position == self._last_cursor_position:
+            return
+        self._last_cursor_position = position
+        self.cursor_position_label.setText(f"Line: {position[0]}, Column: {position[1]}")
 
     @Slot()
     def split_horizontal(self):
@@ -641,28 +954,40 @@ class MainWindow(QMainWindow):
         """Split the editor view vertically"""
         self.split_view_container.split_vertically()
 
-    @Slot(object)
-    def _on_editor_created(self, editor):
-        """Handle editor created signal from split view container"""
-        # This is called when a new editor is created in any split
-        pass
-
-    @Slot(object)
-    def _on_editor_closed(self, editor):
-        """Handle editor closed signal from split view container"""
-        # This is called when an editor is closed in any split
-        pass
-
     @Slot(object)
     def _on_current_editor_changed(self, editor):
         """Handle current editor changed signal from split view container"""
+        # Only the current editor reports cursor moves to the status bar
+        if not hasattr(editor, 'cursor_position_changed'):
+            editor = None
+        if editor is not self._cursor_editor:
+            if self._cursor_editor is not None:
+                try:
+                    self._cursor_editor.cursor_position_changed.disconnect(self._update_cursor_position)
+                except (RuntimeError, TypeError):
+                    # The editor was already deleted
+                    pass
+            if editor is not None:
+                editor.cursor_position_changed.connect(self._update_cursor_position)
+            self._cursor_editor = editor
+
+            # An open search dialog follows the current editor
+            if self._search_dialog is not None:
+                self._search_dialog.set_editor(editor)
+
         # Update UI based on the current editor
-        if editor and hasattr(editor, 'cursor_position_changed'):
+        if editor:
             cursor = editor.textCursor()
             line = cursor.blockNumber() + 1
             column = cursor.columnNumber() + 1
             self._update_cursor_position(line, column)
 
+    @Slot(QWidget, QWidget)
+    def _on_focus_changed(self, old, now):
+        """Track the focused editor for the cursor position display"""
+        if now is not None and now is not self._cursor_editor and hasattr(now, 'cursor_position_changed'):
+            self._on_current_editor_changed(now)
+
     @Slot()
     def compare_files(self):
         """Open file comparison dialog"""
@@ -698,18 +1023,14 @@ class MainWindow(QMainWindow):
         tab_widgets = list(self.split_view_container.editor_tabs.values())
 
         # Create editors for both files
-        editor1 = CodeEditor(self.settings, self.theme_manager)
-        editor2 = CodeEditor(self.settings, self.theme_manager)
-
-        # Connect editor signals
-        editor1.cursor_position_changed.connect(self._update_cursor_position)
-        editor2.cursor_position_changed.connect(self._update_cursor_position)
+        editor1 = self._create_editor()
+        editor2 = self._create_editor()
 
         # Load the files
         if editor1.load_file(file1) and editor2.load_file(file2):
             # Add editors to different tab widgets
-            file1_name = os.path.basename(file1)
-            file2_name = os.path.basename(file2)
+            file1_name = _basename(file1)
+            file2_name = _basename(file2)
 
             self.split_view_container.add_editor(editor1, file1_name, tab_widgets[0])
             self.split_view_container.add_editor(editor2, file2_name, tab_widgets[1])
@@ -723,37 +1044,73 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.critical(self, "Error", "Could not open one or both files for comparison")
 
-    def _save_open_files(self):
-        """Save the list of open files"""
-        open_files = []
+    def _collect_open_tabs(self):
+        """Get the open file paths, whether the welcome tab is open, and the editors with unsaved changes"""
+        # The welcome tab is either still the placeholder or the real screen
+        welcome_tab = self.welcome_screen
+        if welcome_tab is None:
+            welcome_tab = self._welcome_placeholder
         has_welcome_tab = False
+        open_files = []
+        modified_editors = []
 
-        for tab_id, tabs in self.split_view_container.editor_tabs.items():
+        for tabs in tuple(self.split_view_container.editor_tabs.values()):
             for i in range(tabs.count()):
                 widget = tabs.widget(i)
-                tab_text = tabs.tabText(i)
-
-                # Check if welcome tab is still open
-                if tab_text == "Welcome":
+                if widget is welcome_tab:
                     has_welcome_tab = True
                     continue
 
-                if hasattr(widget, 'file_path') and widget.file_path and os.path.exists(widget.file_path):
-                    open_files.append(widget.file_path)
+                if hasattr(widget, 'document') and widget.document().isModified():
+                    modified_editors.append(widget)
+
+                # Paths were checked when the files were opened, and are
+                # checked again when they are restored
+                file_path = getattr(widget, 'file_path', None)
+                if file_path:
+                    open_files.append(file_path)
 
+        return open_files, has_welcome_tab, modified_editors
+
+    def _save_open_files(self, open_files, has_welcome_tab):
+        """Save the list of open files"""
         # Update welcome tab status
         self.settings.set_welcome_tab_closed(not has_welcome_tab)
 
         # Save open files
-        qsettings = QSettings()
-        qsettings.setValue("editor/open_files", open_files)
+        self._qsettings.beginGroup("editor")
+        self._qsettings.setValue("open_files", open_files)
+        self._qsettings.endGroup()
 
     def _restore_open_files(self):
         """Restore previously open files"""
-        qsettings = QSettings()
-        open_files = qsettings.value("editor/open_files", [])
+        self._qsettings.beginGroup("editor")
+        open_files = self._qsettings.value("open_files", [])
+        self._qsettings.endGroup()
 
+        # The files are read in parallel and added in this order as they arrive
         if open_files:
             for file_path in open_files:
-                if os.path.exists(file_path) and os.path.isfile(file_path):
-                    self._open_file(file_path)
+                # A single stat per file, _open_file doesn't repeat it
+                try:
+                    is_file = stat.S_ISREG(os.stat(file_path).st_mode)
+                except (OSError, ValueError):
+                    is_file = False
+                if is_file:
+                    self._open_file(file_path, validated=True)
+
+    @contextmanager
+    def _batched_ui(self):
+        """
+        Suppress repaints and current editor notifications while several
+        editors are added, then update the UI once for the final state.
+        """
+        self.setUpdatesEnabled(False)
+        was_blocked = self.split_view_container.blockSignals(True)
+        try:
+            yield
+        finally:
+            self.split_view_container.blockSignals(was_blocked)
+            self.setUpdatesEnabled(True)
+            if not was_blocked:
+                self._on_current_editor_changed(self.split_view_container.get_current_editor())
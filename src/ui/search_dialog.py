@@ -18,13 +18,13 @@ class SearchDialog(QDialog):
     Dialog for searching and replacing text in the editor.
     """
     # Signals
-    find_next = Signal(str, bool, bool, bool)  # text, case_sensitive, whole_words, regex
-    find_previous = Signal(str, bool, bool, bool)  # text, case_sensitive, whole_words, regex
-    replace = Signal(str, str, bool, bool, bool)  # find_text, replace_text, case_sensitive, whole_words, regex
-    replace_all = Signal(str, str, bool, bool, bool)  # find_text, replace_text, case_sensitive, whole_words, regex
-    
-    def __init__(self, parent=None, selected_text=""):
+    replaced_all = Signal(int)  # number of replacements
+
+    def __init__(self, parent=None, editor=None, selected_text=""):
         super().__init__(parent)
+        # Editor the buttons act on, called directly
+        self._editor = editor
+
         self.setWindowTitle("Find and Replace")
         self.setMinimumWidth(400)
         
@@ -35,6 +35,10 @@ class SearchDialog(QDialog):
             self.search_line_edit.setText(selected_text)
             self.search_line_edit.selectAll()
     
+    def set_editor(self, editor):
+        """Set the editor the dialog searches in"""
+        self._editor = editor
+
     def _setup_ui(self):
         """Set up the UI components"""
         # Main layout
@@ -134,42 +138,41 @@ class SearchDialog(QDialog):
     def _on_find_clicked(self):
         """Handle find button click"""
         search_text = self.search_line_edit.text()
-        if not search_text:
+        if not search_text or self._editor is None:
             return
         
         case_sensitive = self.case_sensitive_check.isChecked()
         whole_words = self.whole_words_check.isChecked()
         regex = self.regex_check.isChecked()
         
-        if self.forward_radio.isChecked():
-            self.find_next.emit(search_text, case_sensitive, whole_words, regex)
-        else:
-            self.find_previous.emit(search_text, case_sensitive, whole_words, regex)
+        self._editor.find_text(search_text, case_sensitive, whole_words, regex,
+                               self.forward_radio.isChecked())
     
     def _on_replace_clicked(self):
         """Handle replace button click"""
         search_text = self.search_line_edit.text()
         replace_text = self.replace_line_edit.text()
         
-        if not search_text:
+        if not search_text or self._editor is None:
             return
         
         case_sensitive = self.case_sensitive_check.isChecked()
         whole_words = self.whole_words_check.isChecked()
         regex = self.regex_check.isChecked()
         
-        self.replace.emit(search_text, replace_text, case_sensitive, whole_words, regex)
+        self._editor.replace_text(search_text, replace_text, case_sensitive, whole_words, regex)
     
     def _on_replace_all_clicked(self):
         """Handle replace all button click"""
         search_text = self.search_line_edit.text()
         replace_text = self.replace_line_edit.text()
         
-        if not search_text:
+        if not search_text or self._editor is None:
             return
         
         case_sensitive = self.case_sensitive_check.isChecked()
         whole_words = self.whole_words_check.isChecked()
         regex = self.regex_check.isChecked()
         
-        self.replace_all.emit(search_text, replace_text, case_sensitive, whole_words, regex)
+        count = self._editor.replace_all(search_text, replace_text, case_sensitive, whole_words, regex)
+        self.replaced_all.emit(count)
@@ -13,7 +13,7 @@ from PySide6.QtWidgets import (
     QWidget, QSplitter, QVBoxLayout, QHBoxLayout,
     QPushButton, QTabWidget, QMenu, QToolButton
 )
-from PySide6.QtCore import Qt, Signal, Slot, QSize, QMimeData, QUrl
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QMimeData, QUrl, QPoint
 from PySide6.QtGui import QIcon, QAction, QDrag, QDragEnterEvent, QDropEvent
 
 class EditorTabWidget(QTabWidget):
@@ -72,6 +72,9 @@ class SplitViewContainer(QWidget):
         self.settings = settings
         self.main_splitter = None
         self.editor_tabs = {}  # Dictionary to track editor tab widgets
+        self._editor_tab_widgets = {}  # Tab widget containing each added editor
+        self._editors_by_path = {}  # Open editors for each file path, in the order added
+        self._editor_paths = {}  # File path each editor is listed under
         self._last_drop_target = None  # Store the last widget that received a drop
         self._last_drop_index = -1  # Store the index where the drop occurred
 
@@ -91,7 +94,7 @@ class SplitViewContainer(QWidget):
         self.layout.addWidget(self.main_splitter)
 
         # Create initial editor tabs
-        self._create_editor_tabs()
+        self._primary_tabs = self._create_editor_tabs()
 
     def _create_editor_tabs(self, parent_splitter=None, orientation=Qt.Horizontal):
         """Create a new editor tab widget"""
@@ -109,9 +112,11 @@ class SplitViewContainer(QWidget):
         parent_splitter.customContextMenuRequested.connect(self._show_splitter_context_menu)
 
         # Connect signals
-        tabs.tabCloseRequested.connect(lambda index: self._on_tab_close_requested(tabs, index))
-        tabs.currentChanged.connect(lambda index: self._on_current_tab_changed(tabs, index))
-        tabs.customContextMenuRequested.connect(lambda pos: self._show_tab_context_menu(tabs, pos))
+        # The slots find the tab widget through sender(), so no closure is
+        # kept per tab widget and signal
+        tabs.tabCloseRequested.connect(self._on_sender_tab_close_requested)
+        tabs.currentChanged.connect(self._on_sender_current_tab_changed)
+        tabs.customContextMenuRequested.connect(self._on_sender_tab_context_menu)
         tabs.file_dropped.connect(self._on_file_dropped)
 
         # Add to tracking dictionary
@@ -119,6 +124,13 @@ class SplitViewContainer(QWidget):
 
         return tabs
 
+    @property
+    def primary_tabs(self):
+        """The first editor tab widget, replaced if that one was closed"""
+        if id(self._primary_tabs) not in self.editor_tabs and self.editor_tabs:
+            self._primary_tabs = next(iter(self.editor_tabs.values()))
+        return self._primary_tabs
+
     def split_horizontally(self, tab_widget=None):
         """Split the view horizontally"""
         if tab_widget is None:
@@ -214,6 +226,21 @@ class SplitViewContainer(QWidget):
 
         return None
 
+    @Slot(int)
+    def _on_sender_tab_close_requested(self, index):
+        """Handle tab close request from the sending tab widget"""
+        self._on_tab_close_requested(self.sender(), index)
+
+    @Slot(int)
+    def _on_sender_current_tab_changed(self, index):
+        """Handle current tab change in the sending tab widget"""
+        self._on_current_tab_changed(self.sender(), index)
+
+    @Slot(QPoint)
+    def _on_sender_tab_context_menu(self, position):
+        """Show the tab context menu of the sending tab widget"""
+        self._show_tab_context_menu(self.sender(), position)
+
     def _on_tab_close_requested(self, tab_widget, index):
         """Handle tab close request"""
         # Get the widget at the index
@@ -226,6 +253,8 @@ class SplitViewContainer(QWidget):
 
         # Remove the tab
         tab_widget.removeTab(index)
+        self._editor_tab_widgets.pop(widget, None)
+        self._forget_editor_path(widget)
 
         # Emit signal
         self.editor_closed.emit(widget)
@@ -321,6 +350,8 @@ class SplitViewContainer(QWidget):
                 tab_widget.removeTab(0)
                 index = target_tab_widget.addTab(widget, text)
                 target_tab_widget.setCurrentIndex(index)
+                if widget in self._editor_tab_widgets:
+                    self._editor_tab_widgets[widget] = target_tab_widget
 
         # Remove this tab widget
         tab_widget.setParent(None)
@@ -359,22 +390,70 @@ class SplitViewContainer(QWidget):
                 tab_widget = self._create_editor_tabs()
 
         # Add the editor to the tab widget
+        is_new = editor not in self._editor_tab_widgets
         index = tab_widget.addTab(editor, title)
         tab_widget.setCurrentIndex(index)
+        self._editor_tab_widgets[editor] = tab_widget
 
         # Set the parent tab widget for the editor
         if hasattr(editor, '_parent_tab_widget'):
             editor._parent_tab_widget = tab_widget
 
         # Connect editor signals
-        if hasattr(editor, 'file_dropped'):
+        if is_new and hasattr(editor, 'file_dropped'):
             editor.file_dropped.connect(self.file_dropped.emit)
 
+        # The unsaved indicator only changes when the modified state flips,
+        # not on every keystroke
+        if is_new and hasattr(editor, 'modificationChanged'):
+            editor.modificationChanged.connect(self._on_sender_modification_changed)
+
+        # Index the editor by its file path, and follow Save As renames
+        if is_new and hasattr(editor, 'file_path_changed'):
+            self._remember_editor_path(editor, editor.file_path)
+            editor.file_path_changed.connect(self._on_sender_file_path_changed)
+
         # Emit signal
         self.editor_created.emit(editor)
 
         return index
 
+    @Slot(bool)
+    def _on_sender_modification_changed(self, modified):
+        """Add or remove the unsaved indicator on the sending editor's tab"""
+        tab_widget, index = self.find_editor_tab(self.sender())
+        if tab_widget is None:
+            return
+        title = tab_widget.tabText(index)
+        if modified and not title.endswith('*'):
+            tab_widget.setTabText(index, title + '*')
+        elif not modified and title.endswith('*'):
+            tab_widget.setTabText(index, title[:-1])
+
+    @Slot(str)
+    def _on_sender_file_path_changed(self, file_path):
+        """List the sending editor under its new file path"""
+        editor = self.sender()
+        if editor in self._editor_tab_widgets:
+            self._forget_editor_path(editor)
+            self._remember_editor_path(editor, file_path)
+
+    def _remember_editor_path(self, editor, file_path):
+        """List an editor under a file path"""
+        if file_path:
+            self._editors_by_path.setdefault(file_path, []).append(editor)
+            self._editor_paths[editor] = file_path
+
+    def _forget_editor_path(self, editor):
+        """Remove an editor from the file path index"""
+        file_path = self._editor_paths.pop(editor, None)
+        if file_path is not None:
+            # Other editors of the same file stay listed
+            editors = self._editors_by_path[file_path]
+            editors.remove(editor)
+            if not editors:
+                del self._editors_by_path[file_path]
+
     def get_all_editors(self):
         """Get all editor widgets"""
         editors = []
@@ -391,18 +470,23 @@ class SplitViewContainer(QWidget):
             return tab_widget.currentWidget()
         return None
 
+    def find_editor_tab(self, editor):
+        """Get the tab widget and tab index of an editor, or (None, -1)"""
+        tab_widget = self._editor_tab_widgets.get(editor)
+        if tab_widget is not None:
+            index = tab_widget.indexOf(editor)
+            if index >= 0:
+                return tab_widget, index
+        return None, -1
+
     def get_last_drop_target(self):
         """Get the last widget that received a file drop"""
         return self._last_drop_target
 
     def get_editor_by_path(self, file_path):
         """Get an editor by its file path"""
-        for tab_id, tabs in self.editor_tabs.items():
-            for i in range(tabs.count()):
-                widget = tabs.widget(i)
-                if hasattr(widget, 'file_path') and widget.file_path == file_path:
-                    return widget
-        return None
+        editors = self._editors_by_path.get(file_path)
+        return editors[0] if editors else None
 
     def _show_splitter_context_menu(self, position):
         """Show context menu for splitter"""
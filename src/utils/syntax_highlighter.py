@@ -6,15 +6,90 @@ Syntax highlighter for McpIDE.
 Uses Pygments for syntax highlighting of various programming languages.
 """
 
-import os
-from PySide6.QtCore import QRegularExpression, Qt
-from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QFont, QColor
-from pygments import highlight
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+from PySide6.QtGui import QSyntaxHighlighter, QTextBlockUserData, QTextCharFormat, QFont, QColor
 from pygments.lexers import get_lexer_for_filename, get_lexer_by_name
 from pygments.lexers.special import TextLexer
 from pygments.token import Token
 from pygments.util import ClassNotFound
 
+def tokenize_lines(lexer, text):
+    """
+    Tokenize a whole text and split the tokens into per-line
+    (start, length, token_type) ranges.
+    """
+    lines = [[]]
+    column = 0
+    for _index, token_type, value in lexer.get_tokens_unprocessed(text):
+        for i, part in enumerate(value.split('\n')):
+            if i > 0:
+                lines.append([])
+                column = 0
+            if part:
+                lines[-1].append((column, len(part), token_type))
+                column += len(part)
+    return lines
+
+
+# Token colors for each theme
+SYNTAX_COLORS = {
+    "dark": {
+        "string": QColor(152, 195, 121),
+        "number": QColor(209, 154, 102),
+        "keyword": QColor(198, 120, 221),
+        "type": QColor(224, 108, 117),
+        "function": QColor(97, 175, 239),
+        "comment": QColor(92, 99, 112),
+        "operator": QColor(86, 182, 194)
+    },
+    "light": {
+        "string": QColor(80, 161, 79),
+        "number": QColor(152, 104, 1),
+        "keyword": QColor(166, 38, 164),
+        "type": QColor(228, 86, 73),
+        "function": QColor(64, 120, 242),
+        "comment": QColor(160, 161, 167),
+        "operator": QColor(1, 132, 188)
+    }
+}
+
+
+class BlockData(QTextBlockUserData):
+    """
+    Per-block cache of the token ranges last computed for the block, and of
+    the block's height for the editor's line number area.
+    """
+    def __init__(self):
+        super().__init__()
+        self.ranges = ()
+        self.ranges_key = None  # (lexer generation, block revision) of the ranges
+        self.height = 0
+        self.height_generation = -1
+        self.height_revision = -1
+
+
+class _HighlightWorkerSignals(QObject):
+    """Signals for the background highlight worker"""
+    finished = Signal(int, object)  # generation, per-line token ranges
+
+
+class _HighlightWorker(QRunnable):
+    """Tokenizes a document's text on a thread pool thread"""
+    def __init__(self, lexer, text, generation):
+        super().__init__()
+        self.lexer = lexer
+        self.text = text
+        self.generation = generation
+        self.signals = _HighlightWorkerSignals()
+
+    def run(self):
+        try:
+            lines = tokenize_lines(self.lexer, self.text)
+        except Exception:
+            lines = None
+        self.signals.finished.emit(self.generation, lines)
+
+
 class PygmentsSyntaxHighlighter(QSyntaxHighlighter):
     """
     Syntax highlighter that uses Pygments for code highlighting.
@@ -23,71 +98,82 @@ class PygmentsSyntaxHighlighter(QSyntaxHighlighter):
         super().__init__(document)
         self.theme_manager = theme_manager
         self.lexer = None
-        self.formats = {}
+
+        # Bumped when the lexer changes, so cached token ranges are recomputed
+        self._lexer_generation = 0
+
+        # State of the background highlight of the whole document
+        self._async_generation = 0
+        self._async_revision = -1
+        self._async_pending = False
+        self._precomputed_lines = None
         
         # Initialize token formats
-        self._create_formats()
+        self._create_formats(theme_manager.settings.get_theme())
     
-    def _create_formats(self):
+    def _create_formats(self, theme):
         """Create text formats for different token types"""
+        colors = SYNTAX_COLORS.get(theme, SYNTAX_COLORS["dark"])
+        self.formats = {}
+
         # Default format
         self.formats[Token] = self._create_format()
         
         # String formats
-        self.formats[Token.Literal.String] = self._create_format(foreground=QColor(152, 195, 121))
-        self.formats[Token.Literal.String.Doc] = self._create_format(foreground=QColor(152, 195, 121))
-        self.formats[Token.Literal.String.Single] = self._create_format(foreground=QColor(152, 195, 121))
-        self.formats[Token.Literal.String.Double] = self._create_format(foreground=QColor(152, 195, 121))
-        self.formats[Token.Literal.String.Backtick] = self._create_format(foreground=QColor(152, 195, 121))
-        self.formats[Token.Literal.String.Escape] = self._create_format(foreground=QColor(209, 154, 102))
+        self.formats[Token.Literal.String] = self._create_format(foreground=colors["string"])
+        self.formats[Token.Literal.String.Doc] = self._create_format(foreground=colors["string"])
+        self.formats[Token.Literal.String.Single] = self._create_format(foreground=colors["string"])
+        self.formats[Token.Literal.String.Double] = self._create_format(foreground=colors["string"])
+        self.formats[Token.Literal.String.Backtick] = self._create_format(foreground=colors["string"])
+        self.formats[Token.Literal.String.Escape] = self._create_format(foreground=colors["number"])
         
         # Number formats
-        self.formats[Token.Literal.Number] = self._create_format(foreground=QColor(209, 154, 102))
-        self.formats[Token.Literal.Number.Integer] = self._create_format(foreground=QColor(209, 154, 102))
-        self.formats[Token.Literal.Number.Float] = self._create_format(foreground=QColor(209, 154, 102))
-        self.formats[Token.Literal.Number.Hex] = self._create_format(foreground=QColor(209, 154, 102))
+        self.formats[Token.Literal.Number] = self._create_format(foreground=colors["number"])
+        self.formats[Token.Literal.Number.Integer] = self._create_format(foreground=colors["number"])
+        self.formats[Token.Literal.Number.Float] = self._create_format(foreground=colors["number"])
+        self.formats[Token.Literal.Number.Hex] = self._create_format(foreground=colors["number"])
         
         # Keyword formats
-        self.formats[Token.Keyword] = self._create_format(foreground=QColor(198, 120, 221), bold=True)
-        self.formats[Token.Keyword.Constant] = self._create_format(foreground=QColor(198, 120, 221), bold=True)
-        self.formats[Token.Keyword.Declaration] = self._create_format(foreground=QColor(198, 120, 221), bold=True)
-        self.formats[Token.Keyword.Namespace] = self._create_format(foreground=QColor(198, 120, 221), bold=True)
-        self.formats[Token.Keyword.Reserved] = self._create_format(foreground=QColor(198, 120, 221), bold=True)
-        self.formats[Token.Keyword.Type] = self._create_format(foreground=QColor(224, 108, 117), bold=True)
+        self.formats[Token.Keyword] = self._create_format(foreground=colors["keyword"], bold=True)
+        self.formats[Token.Keyword.Constant] = self._create_format(foreground=colors["keyword"], bold=True)
+        self.formats[Token.Keyword.Declaration] = self._create_format(foreground=colors["keyword"], bold=True)
+        self.formats[Token.Keyword.Namespace] = self._create_format(foreground=colors["keyword"], bold=True)
+        self.formats[Token.Keyword.Reserved] = self._create_format(foreground=colors["keyword"], bold=True)
+        self.formats[Token.Keyword.Type] = self._create_format(foreground=colors["type"], bold=True)
         
         # Name formats
         self.formats[Token.Name] = self._create_format()
-        self.formats[Token.Name.Class] = self._create_format(foreground=QColor(224, 108, 117), bold=True)
-        self.formats[Token.Name.Function] = self._create_format(foreground=QColor(97, 175, 239))
-        self.formats[Token.Name.Builtin] = self._create_format(foreground=QColor(224, 108, 117))
-        self.formats[Token.Name.Builtin.Pseudo] = self._create_format(foreground=QColor(224, 108, 117))
-        self.formats[Token.Name.Exception] = self._create_format(foreground=QColor(224, 108, 117), bold=True)
-        self.formats[Token.Name.Decorator] = self._create_format(foreground=QColor(97, 175, 239))
-        self.formats[Token.Name.Namespace] = self._create_format(foreground=QColor(224, 108, 117))
-        self.formats[Token.Name.Constant] = self._create_format(foreground=QColor(209, 154, 102))
+        self.formats[Token.Name.Class] = self._create_format(foreground=colors["type"], bold=True)
+        self.formats[Token.Name.Function] = self._create_format(foreground=colors["function"])
+        self.formats[Token.Name.Builtin] = self._create_format(foreground=colors["type"])
+        self.formats[Token.Name.Builtin.Pseudo] = self._create_format(foreground=colors["type"])
+        self.formats[Token.Name.Exception] = self._create_format(foreground=colors["type"], bold=True)
+        self.formats[Token.Name.Decorator] = self._create_format(foreground=colors["function"])
+        self.formats[Token.Name.Namespace] = self._create_format(foreground=colors["type"])
+        self.formats[Token.Name.Constant] = self._create_format(foreground=colors["number"])
         
         # Comment formats
-        self.formats[Token.Comment] = self._create_format(foreground=QColor(92, 99, 112), italic=True)
-        self.formats[Token.Comment.Single] = self._create_format(foreground=QColor(92, 99, 112), italic=True)
-        self.formats[Token.Comment.Multiline] = self._create_format(foreground=QColor(92, 99, 112), italic=True)
-        self.formats[Token.Comment.Preproc] = self._create_format(foreground=QColor(92, 99, 112))
+        self.formats[Token.Comment] = self._create_format(foreground=colors["comment"], italic=True)
+        self.formats[Token.Comment.Single] = self._create_format(foreground=colors["comment"], italic=True)
+        self.formats[Token.Comment.Multiline] = self._create_format(foreground=colors["comment"], italic=True)
+        self.formats[Token.Comment.Preproc] = self._create_format(foreground=colors["comment"])
         
         # Operator formats
-        self.formats[Token.Operator] = self._create_format(foreground=QColor(86, 182, 194))
-        self.formats[Token.Operator.Word] = self._create_format(foreground=QColor(86, 182, 194), bold=True)
+        self.formats[Token.Operator] = self._create_format(foreground=colors["operator"])
+        self.formats[Token.Operator.Word] = self._create_format(foreground=colors["operator"], bold=True)
         
         # Punctuation formats
-        self.formats[Token.Punctuation] = self._create_format(foreground=QColor(86, 182, 194))
+        self.formats[Token.Punctuation] = self._create_format(foreground=colors["operator"])
         
         # Error formats
-        self.formats[Token.Error] = self._create_format(foreground=QColor(224, 108, 117), underline=True)
+        self.formats[Token.Error] = self._create_format(foreground=colors["type"], underline=True)
         
         # Generic formats
-        self.formats[Token.Generic.Heading] = self._create_format(foreground=QColor(97, 175, 239), bold=True)
-        self.formats[Token.Generic.Subheading] = self._create_format(foreground=QColor(97, 175, 239), bold=True)
-        self.formats[Token.Generic.Deleted] = self._create_format(foreground=QColor(224, 108, 117))
-        self.formats[Token.Generic.Inserted] = self._create_format(foreground=QColor(152, 195, 121))
-        self.formats[Token.Generic.Error] = self._create_format(foreground=QColor(224, 108, 117), underline=True)
+        self.formats[Token.Generic.Heading] = self._create_format(foreground=colors["function"], bold=True)
+        self.formats[Token.Generic.Subheading] = self._create_format(foreground=colors["function"], bold=True)
+        self.formats[Token.Generic.Deleted] = self._create_format(foreground=colors["type"])
+        self.formats[Token.Generic.Inserted] = self._create_format(foreground=colors["string"])
+        self.formats[Token.Generic.Error] = self._create_format(foreground=colors["type"], underline=True)
         self.formats[Token.Generic.Emph] = self._create_format(italic=True)
         self.formats[Token.Generic.Strong] = self._create_format(bold=True)
     
@@ -114,8 +200,11 @@ class PygmentsSyntaxHighlighter(QSyntaxHighlighter):
     
     def set_theme(self, theme):
         """Update formats based on theme"""
-        # TODO: Implement theme-based highlighting
-        pass
+        self._create_formats(theme)
+        
+        # The token ranges cached per block are reused, so this only applies
+        # the new formats without running the lexer again
+        self.rehighlight()
     
     def set_lexer_from_filename(self, filename):
         """Set the lexer based on the file extension"""
@@ -126,6 +215,8 @@ class PygmentsSyntaxHighlighter(QSyntaxHighlighter):
             self.lexer = TextLexer()
         
         # Rehighlight the document
+        self._lexer_generation += 1
+        self._cancel_async_highlight()
         self.rehighlight()
     
     def set_lexer_from_language(self, language):
@@ -137,31 +228,92 @@ class PygmentsSyntaxHighlighter(QSyntaxHighlighter):
             self.lexer = TextLexer()
         
         # Rehighlight the document
+        self._lexer_generation += 1
+        self._cancel_async_highlight()
         self.rehighlight()
     
+    def rehighlight_async(self):
+        """
+        Tokenize the whole document on a worker thread and apply the formats
+        when done. Blocks are left unformatted until the worker finishes.
+        """
+        document = self.document()
+        if document is None or not self.lexer:
+            return
+        
+        self._async_generation += 1
+        self._async_pending = True
+        self._async_revision = document.revision()
+        
+        worker = _HighlightWorker(self.lexer, document.toPlainText(), self._async_generation)
+        worker.signals.finished.connect(self._on_async_highlight_finished)
+        QThreadPool.globalInstance().start(worker)
+    
+    def _cancel_async_highlight(self):
+        """Ignore the result of a running background highlight"""
+        self._async_generation += 1
+        self._async_pending = False
+    
+    @Slot(int, object)
+    def _on_async_highlight_finished(self, generation, lines):
+        """Apply the formats computed by the background worker"""
+        if generation != self._async_generation:
+            # Superseded by a newer request or a lexer change
+            return
+        
+        document = self.document()
+        if document is None:
+            self._async_pending = False
+            return
+        
+        if document.revision() != self._async_revision:
+            # The text changed while tokenizing, start over
+            self.rehighlight_async()
+            return
+        
+        self._async_pending = False
+        if lines is None or len(lines) != document.blockCount():
+            # Tokenizing failed or lines don't map onto blocks
+            self.rehighlight()
+            return
+        
+        self._precomputed_lines = lines
+        try:
+            self.rehighlight()
+        finally:
+            self._precomputed_lines = None
+    
     def highlightBlock(self, text):
         """Highlight a block of text"""
-        if not self.lexer:
+        if not self.lexer or self._async_pending:
             return
         
-        # Get the current block's state
-        current_state = self.previousBlockState()
-        
-        # Process the text with Pygments
-        tokens = list(self.lexer.get_tokens(text))
-        
-        # Apply formatting
-        position = 0
-        for token_type, token_text in tokens:
-            length = len(token_text)
-            
-            # Find the most specific format for this token type
-            token_format = self._get_format_for_token(token_type)
-            
-            if token_format:
-                self.setFormat(position, length, token_format)
-            
-            position += length
+        block = self.currentBlock()
+        data = self.currentBlockUserData()
+        if data is None:
+            data = BlockData()
+            self.setCurrentBlockUserData(data)
+        
+        # The block revision changes whenever the block's text does, so the
+        # ranges are only recomputed for edited blocks or a new lexer
+        key = (self._lexer_generation, block.revision())
+        if self._precomputed_lines is not None:
+            # Use the ranges from the background worker when applying its results
+            data.ranges = self._precomputed_lines[block.blockNumber()]
+            data.ranges_key = key
+        elif data.ranges_key != key:
+            # Process the text with Pygments the same way the worker does, so
+            # the offsets match and no leading whitespace is stripped
+            data.ranges = [
+                (start, len(value), token_type)
+                for start, token_type, value in self.lexer.get_tokens_unprocessed(text)
+                if value
+            ]
+            data.ranges_key = key
+        
+        # Apply formatting, finding the most specific format for each token type
+        for start, length, token_type in data.ranges:
+            self.setFormat(start, length, self._get_format_for_token(token_type))
     
     def _get_format_for_token(self, token_type):
         """Get the most specific format for a token type"""